@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 import argparse
+import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 
 from haven.adapters.config import config
 from haven.adapters.rentcast_client import RentCastClient
 from haven.adapters.rentcast_source import RentCastSaleListingSource
 from haven.adapters.sql_repo import SqlPropertyRepository
+from haven.domain.ports import PropertyRecord
 
 
 def parse_args() -> argparse.Namespace:
@@ -18,6 +21,12 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--max-price", dest="max_price", type=float, default=None)
     p.add_argument("--limit", dest="limit", type=int, default=200)
     p.add_argument("--workers", dest="workers", type=int, default=8)
+    p.add_argument(
+        "--out",
+        dest="out",
+        default=None,
+        help="write fetched listings to this JSON-lines file instead of upserting them",
+    )
     return p.parse_args()
 
 
@@ -27,33 +36,48 @@ def main() -> None:
     if not config.RENTCAST_API_KEY:
         raise SystemExit("Missing HAVEN_RENTCAST_API_KEY")
 
-    repo = SqlPropertyRepository(config.DB_URI)
-
     client = RentCastClient(
         base_url=config.RENTCAST_BASE_URL,
         api_key=config.RENTCAST_API_KEY,
     )
     source = RentCastSaleListingSource(client=client)
 
-    def ingest_zip(z: str) -> tuple[str, int]:
+    def fetch_zip(z: str) -> tuple[str, list[PropertyRecord]]:
         props = source.fetch_by_zip(
             zipcode=z,
             limit=args.limit,
             max_price=args.max_price,
             offset=0,
         )
-        n = repo.upsert_many(props)
-        return z, n
-
-    total = 0
-    with ThreadPoolExecutor(max_workers=args.workers) as ex:
-        futs = [ex.submit(ingest_zip, z) for z in args.zips]
-        for f in as_completed(futs):
-            z, n = f.result()
-            print(f"[{z}] upserted {n} properties")
-            total += n
-
-    print(f"Done. Total properties upserted: {total}")
+        return z, props
+
+    # Worker threads only fetch; listings are written from this thread, so
+    # the DB (or the --out file) has a single writer.
+    with ExitStack() as stack:
+        if args.out:
+            out = stack.enter_context(open(args.out, "w", encoding="utf-8"))
+
+            def write(props: list[PropertyRecord]) -> int:
+                # one write per ZIP, flushed, so a later failure keeps it
+                out.write("".join(json.dumps(p) + "\n" for p in props))
+                out.flush()
+                return len(props)
+
+            verb = "fetched"
+        else:
+            write = SqlPropertyRepository(config.DB_URI).upsert_many
+            verb = "upserted"
+
+        total = 0
+        with ThreadPoolExecutor(max_workers=args.workers) as ex:
+            futs = [ex.submit(fetch_zip, z) for z in args.zips]
+            for f in as_completed(futs):
+                z, props = f.result()
+                n = write(props)
+                print(f"[{z}] {verb} {n} properties")
+                total += n
+
+    print(f"Done. Total properties {verb}: {total}")
 
 
 if __name__ == "__main__":
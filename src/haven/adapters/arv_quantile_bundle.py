@@ -5,11 +5,16 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import numpy as np
+
 from haven.adapters.config import config
 
 _path_str = getattr(config, "ARV_QUANTILE_PATH", None)
 _BUNDLE_PATH: Optional[Path] = Path(_path_str) if _path_str else None
 
+# LightGBM threads per predict call; 0 leaves the count to OpenMP.
+_num_threads = 0
+
 
 @lru_cache
 def _load_bundle() -> Optional[Dict[str, Any]]:
@@ -24,6 +29,24 @@ def _load_bundle() -> Optional[Dict[str, Any]]:
         return pickle.load(f)
 
 
+def preload_bundle() -> None:
+    """Load the bundle now rather than on the first prediction."""
+    _load_bundle()
+
+
+def set_num_threads(num_threads: int) -> None:
+    """LightGBM thread count for later ARV predictions (e.g. 1 in pool workers)."""
+    global _num_threads
+    _num_threads = num_threads
+
+
+def _predict(model: Any, X: Any) -> Any:
+    # only LightGBM models (Booster / sklearn wrappers) take num_threads
+    if _num_threads and type(model).__module__.split(".")[0] == "lightgbm":
+        return model.predict(X, num_threads=_num_threads)
+    return model.predict(X)
+
+
 def predict_arv_quantiles(features: Dict[str, float]) -> Dict[str, float]:
     """
     Predict ARV quantiles.
@@ -55,7 +78,40 @@ def predict_arv_quantiles(features: Dict[str, float]) -> Dict[str, float]:
     X = [[features.get(col, 0.0) for col in feature_cols]]
 
     return {
-        "q10": float(q10_model.predict(X)[0]),
-        "q50": float(q50_model.predict(X)[0]),
-        "q90": float(q90_model.predict(X)[0]),
+        "q10": float(_predict(q10_model, X)[0]),
+        "q50": float(_predict(q50_model, X)[0]),
+        "q90": float(_predict(q90_model, X)[0]),
     }
+
+
+def predict_arv_quantiles_batch(features: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Batched predict_arv_quantiles: `features` maps feature name -> 1-D array
+    (one entry per deal). Returns an (N, 3) array of q10/q50/q90 rows, same
+    values as calling predict_arv_quantiles per deal.
+    """
+    bundle = _load_bundle()
+
+    base = np.asarray(features.get("base", 0.0), dtype=float)
+    if bundle is None:
+        base = np.atleast_1d(base)
+        spread = base * 0.10
+        out = np.column_stack([base - spread, base, base + spread])
+        out[base <= 0] = 0.0
+        return out
+
+    n = max((np.size(v) for v in features.values()), default=0)
+    feature_cols = bundle["feature_cols"]
+    X = np.column_stack(
+        [
+            np.broadcast_to(np.asarray(features.get(col, 0.0), dtype=float), (n,))
+            for col in feature_cols
+        ]
+    )
+    return np.column_stack(
+        [
+            np.asarray(_predict(bundle["q10"], X), dtype=float),
+            np.asarray(_predict(bundle["q50"], X), dtype=float),
+            np.asarray(_predict(bundle["q90"], X), dtype=float),
+        ]
+    )
@@ -1,6 +1,6 @@
 # src/haven/adapters/config.py
 import os
-from typing import Any
+from typing import Any, Callable
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -43,6 +43,11 @@ class AppConfig(BaseSettings):
         extra="ignore",
     )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        for listener in _change_listeners:
+            listener(name)
+
     @field_validator(
         "VACANCY_RATE",
         "MAINTENANCE_RATE",
@@ -76,4 +81,15 @@ class AppConfig(BaseSettings):
         return f
 
 
+_change_listeners: list[Callable[[str], None]] = []
+
+
+def on_config_change(listener: Callable[[str], None]) -> None:
+    """
+    Register `listener(field_name)` to run after any runtime assignment to a
+    config field, for modules that cache values derived from config.
+    """
+    _change_listeners.append(listener)
+
+
 config = AppConfig()
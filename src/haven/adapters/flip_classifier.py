@@ -1,16 +1,25 @@
 # src/haven/adapters/flip_classifier.py
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 from typing import Any, Dict, List
 
 import joblib
 import numpy as np
 
+from haven.adapters.lgbm_fast import SingleRowPredictor
 from haven.adapters.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Canonical column order for predict_proba_row / predict_proba_rows. Model
+# features outside this tuple are fed as 0.
+FLIP_FEATURE_ORDER = ("dscr", "cash_on_cash_return", "breakeven_occupancy_pct", "price", "sqft", "days_on_market")
+
+# Stored in a thread's buffers once SingleRowPredictor failed to build for it.
+_UNAVAILABLE = object()
+
 
 class FlipClassifier:
     """
@@ -20,16 +29,25 @@ class FlipClassifier:
     Expects a joblib bundle with keys:
       - "feature_names": List[str]
       - "model": sklearn-compatible classifier with predict_proba
+
+    For fitted LightGBM classifiers the underlying Booster is kept and batch
+    predictions call it directly, skipping the sklearn wrapper's per-call
+    validation. num_threads=0 leaves the thread count to OpenMP;
+    set_num_threads changes it after loading.
     """
 
     def __init__(
         self,
         model_path: str | Path = "models/flip_classifier_lgb.joblib",
+        num_threads: int = 0,
     ) -> None:
         self.model_path = Path(model_path)
+        self.num_threads = num_threads
         self.is_ready: bool = False
         self.feature_names: List[str] = []
         self.model: Any | None = None
+        self._booster: Any | None = None
+        self._buffers = threading.local()
         self._load()
 
     def _load(self) -> None:
@@ -61,6 +79,14 @@ class FlipClassifier:
 
         self.feature_names = list(feature_names)
         self.is_ready = True
+        self._booster = _binary_booster(self.model)
+        # FLIP_FEATURE_ORDER column -> model column, fixed once the bundle is loaded
+        self._canon_dst = np.array(
+            [i for i, n in enumerate(self.feature_names) if n in FLIP_FEATURE_ORDER], dtype=np.intp
+        )
+        self._canon_src = np.array(
+            [FLIP_FEATURE_ORDER.index(n) for n in self.feature_names if n in FLIP_FEATURE_ORDER], dtype=np.intp
+        )
 
         logger.info(
             "flip_classifier_loaded",
@@ -70,6 +96,12 @@ class FlipClassifier:
             },
         )
 
+    def set_num_threads(self, num_threads: int) -> None:
+        """LightGBM thread count for later predictions (e.g. 1 in pool workers)."""
+        self.num_threads = num_threads
+        # fast predictors bake the thread count into their config; rebuild lazily
+        self._buffers = threading.local()
+
     def predict_proba_one(self, features: Dict[str, float]) -> float | None:
         """
         Predict probability that a given deal is a "good flip".
@@ -87,13 +119,100 @@ class FlipClassifier:
         if not self.is_ready or self.model is None:
             return None
 
+        row = np.array(
+            [float(features.get(name, 0.0)) for name in self.feature_names],
+            dtype=float,
+        )
+        return self.predict_proba_values(row)
+
+    def predict_proba_row(self, arr: np.ndarray) -> float | None:
+        """
+        predict_proba_one for a 1-D array in FLIP_FEATURE_ORDER (no dict).
+        LightGBM binary models go through the single-row fast C path.
+        """
+        fast = self._single_row_predictor()
+        if fast is None:
+            proba = self.predict_proba_rows(np.asarray(arr).reshape(1, -1))
+            return None if proba is None else float(proba[0])
+
+        fast.row[self._canon_dst] = np.asarray(arr)[self._canon_src]
         try:
-            row = np.array(
-                [[float(features.get(name, 0.0)) for name in self.feature_names]],
-                dtype=float,
+            return fast.predict()
+        except Exception as exc:
+            logger.exception(
+                "flip_classifier_predict_failed",
+                extra={"error": str(exc)},
             )
+            return None
+
+    def _single_row_predictor(self) -> SingleRowPredictor | None:
+        """This thread's SingleRowPredictor, or None when the model can't use one."""
+        if not self.is_ready or self._booster is None:
+            return None
+        cached = getattr(self._buffers, "fast", None)
+        if cached is _UNAVAILABLE:
+            return None
+        if isinstance(cached, SingleRowPredictor):
+            return cached
+        try:
+            fast = SingleRowPredictor(self._booster, len(self.feature_names), self.num_threads)
+        except Exception as exc:  # C API missing / changed in this LightGBM build
+            logger.warning("flip_classifier_fast_predict_unavailable", extra={"error": str(exc)})
+            self._buffers.fast = _UNAVAILABLE
+            return None
+        self._buffers.fast = fast
+        return fast
 
-            proba = self.model.predict_proba(row)[0, 1]
+    def predict_proba_rows(self, X: np.ndarray) -> np.ndarray | None:
+        """
+        Batched predict_proba_row: X is (N, len(FLIP_FEATURE_ORDER)). Rows are
+        scattered into a per-thread float32 buffer in model column order
+        (reused across calls), then scored with predict_proba_many.
+        """
+        if not self.is_ready or self.model is None:
+            return None
+
+        n = len(X)
+        buf = getattr(self._buffers, "buf", None)
+        if buf is None or len(buf) < n:
+            buf = np.zeros((max(n, 64), len(self.feature_names)), dtype=np.float32)
+            self._buffers.buf = buf
+        feat = buf[:n]
+        # only the mapped columns are ever written, so the rest stay 0
+        feat[:, self._canon_dst] = X[:, self._canon_src]
+        return self.predict_proba_many(feat)
+
+    def predict_proba_many(self, X: np.ndarray) -> np.ndarray | None:
+        """
+        Batched predict_proba_values: X is (N, n_features) in `feature_names`
+        order, float32 or float64 (LightGBM takes either without a copy).
+        Returns N probabilities, or None if the model is unavailable or
+        prediction fails.
+        """
+        if not self.is_ready or self.model is None:
+            return None
+
+        try:
+            if self._booster is not None:
+                return np.asarray(self._booster.predict(X, num_threads=self.num_threads), dtype=float)
+            return np.asarray(self.model.predict_proba(X)[:, 1], dtype=float)
+        except Exception as exc:
+            logger.exception(
+                "flip_classifier_predict_failed",
+                extra={"error": str(exc)},
+            )
+            return None
+
+    def predict_proba_values(self, values: np.ndarray) -> float | None:
+        """
+        Same as predict_proba_one, for a 1-D float array already laid out in
+        `feature_names` order (skips the per-call dict lookups).
+        """
+        if not self.is_ready or self.model is None:
+            return None
+
+        try:
+            proba = self.model.predict_proba(values.reshape(1, -1))[0, 1]
             return float(proba)
         except Exception as exc:
             logger.exception(
@@ -101,3 +220,13 @@ class FlipClassifier:
                 extra={"error": str(exc)},
             )
             return None
+
+
+def _binary_booster(model: Any) -> Any | None:
+    """The fitted LightGBM Booster behind a binary LGBMClassifier, else None."""
+    if getattr(model, "n_classes_", None) != 2:
+        return None
+    try:
+        return getattr(model, "booster_", None)
+    except Exception:  # sklearn NotFittedError for unfitted wrappers
+        return None
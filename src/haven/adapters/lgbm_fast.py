@@ -0,0 +1,58 @@
+# src/haven/adapters/lgbm_fast.py
+from __future__ import annotations
+
+import ctypes
+from typing import Any
+
+import numpy as np
+
+
+class SingleRowPredictor:
+    """
+    LightGBM's single-row fast prediction (LGBM_BoosterPredictForMatSingleRowFast).
+
+    The prediction config is set up once, so each call only scores the row
+    already written into `row` (model column order). Results match
+    Booster.predict on the same row and dtype. Not thread-safe: keep one per
+    thread. Raises at construction if this LightGBM build lacks the C entry
+    point, so callers can fall back to Booster.predict.
+    """
+
+    def __init__(self, booster: Any, n_features: int, num_threads: int = 0, dtype: Any = np.float32) -> None:
+        from lightgbm import basic
+
+        self._lib = basic._LIB
+        self._safe_call = basic._safe_call
+        self._config = ctypes.c_void_p()
+        self.row = np.zeros(n_features, dtype=dtype)
+        self._out = np.zeros(1, dtype=np.float64)
+        self._out_len = ctypes.c_int64()
+        self._row_ptr = self.row.ctypes.data_as(ctypes.c_void_p)
+        self._out_ptr = self._out.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+        c_dtype = basic._C_API_DTYPE_FLOAT32 if self.row.dtype == np.float32 else basic._C_API_DTYPE_FLOAT64
+        # same iterations as Booster.predict's default (best_iteration, <= 0 -> all)
+        self._safe_call(
+            self._lib.LGBM_BoosterPredictForMatSingleRowFastInit(
+                booster._handle,
+                ctypes.c_int(basic._C_API_PREDICT_NORMAL),
+                ctypes.c_int(0),
+                ctypes.c_int(booster.best_iteration),
+                ctypes.c_int(c_dtype),
+                ctypes.c_int32(n_features),
+                basic._c_str(f"num_threads={num_threads}"),
+                ctypes.byref(self._config),
+            )
+        )
+
+    def predict(self) -> float:
+        self._safe_call(
+            self._lib.LGBM_BoosterPredictForMatSingleRowFast(
+                self._config, self._row_ptr, ctypes.byref(self._out_len), self._out_ptr
+            )
+        )
+        return float(self._out[0])
+
+    def __del__(self) -> None:
+        config = getattr(self, "_config", None)
+        if config:
+            self._lib.LGBM_FastConfigFree(config)
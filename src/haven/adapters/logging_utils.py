@@ -1,10 +1,14 @@
-import json
 import logging
 import sys
 import time
 
+import orjson
+
 from .config import config
 
+# numpy scalars/arrays in context are common (model outputs); non-str keys are stringified
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
 
 class JsonLogFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
@@ -14,11 +18,14 @@ class JsonLogFormatter(logging.Formatter):
             "logger": record.name,
             "message": record.getMessage(),
         }
-        # attach contextual info if provided
+        # attach contextual info if provided; a callable context is only
+        # evaluated here, i.e. when the record is actually emitted
         ctx = getattr(record, "context", None)
+        if callable(ctx):
+            ctx = ctx()
         if isinstance(ctx, dict):
             payload.update(ctx)
-        return json.dumps(payload)
+        return orjson.dumps(payload, default=str, option=_ORJSON_OPTIONS).decode()
 
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
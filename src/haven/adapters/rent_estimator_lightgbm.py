@@ -1,17 +1,42 @@
 # src/haven/adapters/rent_estimator_lightgbm.py
 from __future__ import annotations
 
+import logging
+import threading
 from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 import joblib
 import numpy as np
+import pandas as pd
 
+from haven.adapters.lgbm_fast import SingleRowPredictor
 from haven.adapters.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Memoized median rents per encoded feature row (bounded, oldest evicted first).
+_RENT_CACHE_SIZE = 4096
+
+# Stored in a thread's _local once SingleRowPredictor failed to build for it.
+_UNAVAILABLE = object()
+
+
+@lru_cache(maxsize=4096)
+def _zipcode_feature(zipcode: str) -> float:
+    """Numeric zipcode feature (0 unless all digits), memoized per distinct string."""
+    zipcode = zipcode.strip().zfill(5)
+    return float(int(zipcode)) if zipcode.isdigit() else 0.0
+
+
+@lru_cache(maxsize=256)
+def _property_type_feature(property_type: str) -> float:
+    """1.0 for single_family (the default when blank), else 0.0."""
+    return 1.0 if (property_type.strip() or "single_family") == "single_family" else 0.0
+
 
 @dataclass
 class RentModelBundle:
@@ -27,9 +52,25 @@ class LightGBMRentEstimator:
     Looks for:
       - models/rent_quantiles_with_neighborhood.joblib (preferred)
       - models/rent_quantiles.joblib (fallback)
+
+    Fitted LightGBM regressors are predicted through their Booster directly,
+    skipping the sklearn wrapper's per-call validation; single-unit calls
+    use LightGBM's single-row fast path. num_threads=0 leaves the thread
+    count to OpenMP; set_num_threads changes it after loading.
+
+    Predictions are memoized per exact encoded feature row (beds, baths,
+    sqft, zipcode, type): scanning a ZIP repeats the same few unit shapes,
+    which then skip the model. clear_cache() drops the memo.
     """
 
-    def __init__(self, model_path: str | None = None) -> None:
+    def __init__(self, model_path: str | None = None, num_threads: int = 0) -> None:
+        self.num_threads = num_threads
+        self._predictors: Dict[float, Callable[[np.ndarray], Any]] = {}
+        self._median_booster: Any | None = None
+        self._local = threading.local()
+        self._rent_cache: Dict[tuple, float] = {}
+        # guards cache writes / eviction; reads snapshot hits with dict.get
+        self._cache_lock = threading.Lock()
         if model_path is not None:
             self.model_path = Path(model_path)
         else:
@@ -49,9 +90,47 @@ class LightGBMRentEstimator:
             feature_names=bundle_raw["feature_names"],
             models=bundle_raw["models"],
         )
+        self._predictors = {
+            alpha: self._raw_predictor(model) for alpha, model in self.bundle.models.items()
+        }
+        if 0.5 in self.bundle.models:
+            self._median_booster = _booster_of(self.bundle.models[0.5])
         self.is_ready = True
         logger.info("rent_model_loaded", extra={"path": str(self.model_path), "alphas": self.bundle.alphas})
 
+    def _raw_predictor(self, model: Any) -> Callable[[np.ndarray], Any]:
+        """Booster.predict for a fitted LGBMRegressor, else the model's own predict."""
+        booster = _booster_of(model)
+        if booster is None:
+            return model.predict
+        return partial(booster.predict, num_threads=self.num_threads)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # per-thread fast predictors hold C handles; workers build their own
+        state = self.__dict__.copy()
+        state.pop("_local", None)
+        state.pop("_cache_lock", None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+
+    def set_num_threads(self, num_threads: int) -> None:
+        """LightGBM thread count for later predictions (e.g. 1 in pool workers)."""
+        self.num_threads = num_threads
+        if self.bundle is not None:
+            self._predictors = {
+                alpha: self._raw_predictor(model) for alpha, model in self.bundle.models.items()
+            }
+        # fast predictors bake the thread count into their config; rebuild lazily
+        self._local = threading.local()
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._rent_cache.clear()
+
     def _ensure_ready(self) -> None:
         if not getattr(self, "is_ready", False) or self.bundle is None:
             raise RuntimeError("Rent model not loaded. Train rent_quantiles_with_neighborhood first.")
@@ -70,8 +149,6 @@ class LightGBMRentEstimator:
         training time via zipcode merge; at inference we just need core fields.
         """
         self._ensure_ready()
-        zipcode = str(zipcode).strip().zfill(5)
-        property_type = str(property_type).strip() or "single_family"
 
         feat: Dict[str, float] = {}
         for name in self.bundle.feature_names:
@@ -82,9 +159,9 @@ class LightGBMRentEstimator:
             elif name == "sqft":
                 feat[name] = float(sqft)
             elif name == "zipcode":
-                feat[name] = float(int(zipcode)) if zipcode.isdigit() else 0.0
+                feat[name] = _zipcode_feature(str(zipcode))
             elif name == "property_type":
-                feat[name] = 1.0 if property_type == "single_family" else 0.0
+                feat[name] = _property_type_feature(str(property_type))
             else:
                 feat[name] = 0.0
 
@@ -93,11 +170,11 @@ class LightGBMRentEstimator:
     def predict_unit_rent(
         self,
         *,
-        bedrooms: float,
-        bathrooms: float,
-        sqft: float,
+        bedrooms: float | None,
+        bathrooms: float | None,
+        sqft: float | None,
         zipcode: str,
-        property_type: str,
+        property_type: str | None = None,
         # Backward-compatible extras (ignored for LightGBM)
         address: str | None = None,
         city: str | None = None,
@@ -108,8 +185,10 @@ class LightGBMRentEstimator:
         Accepts optional address fields for compatibility with RentCast, but does not use them.
         """
         if not getattr(self, "is_ready", False) or self.bundle is None:
-            # last-resort: crude heuristic
-            logger.warning("rent_predict_fallback", extra={"reason": "model_not_ready"})
+            # last-resort: crude heuristic (the missing model was already
+            # reported once at load time as rent_model_not_found)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("rent_predict_fallback", extra={"reason": "model_not_ready"})
             sqft_f = float(sqft or 0.0)
             beds_f = float(bedrooms or 0.0)
             # basic: $1.10/sqft + $150/bedroom floor
@@ -123,18 +202,140 @@ class LightGBMRentEstimator:
             property_type=str(property_type or "single_family"),
         )
 
-        X = np.array([[feat_row[name] for name in self.bundle.feature_names]])
+        row = [feat_row[name] for name in self.bundle.feature_names]
+        key = tuple(row)
+        cached = self._rent_cache.get(key)
+        if cached is not None:
+            return cached
+
+        fast = self._single_row_predictor()
+        if fast is None:
+            return float(self._predict_matrix(np.array([row]), np.array([float(sqft or 0.0)]))[0])
 
-        models = self.bundle.models
+        fast.row[:] = row
         try:
-            if 0.5 in models:
-                pred = float(models[0.5].predict(X)[0])
-            else:
-                preds = [float(m.predict(X)[0]) for m in models.values()]
-                pred = float(sum(preds) / max(len(preds), 1))
+            rent = max(fast.predict(), 0.0)
         except Exception as e:
             logger.warning("rent_predict_exception", extra={"error": str(e)})
-            sqft_f = float(sqft or 0.0)
-            pred = 1.10 * sqft_f
+            return max(1.10 * float(sqft or 0.0), 0.0)
+        self._remember({key: rent})
+        return rent
+
+    def _single_row_predictor(self) -> SingleRowPredictor | None:
+        """This thread's single-row predictor for the median model, if it is a LightGBM Booster."""
+        if self._median_booster is None or self.bundle is None:
+            return None
+        cached = getattr(self._local, "fast", None)
+        if cached is _UNAVAILABLE:
+            return None
+        if isinstance(cached, SingleRowPredictor):
+            return cached
+        try:
+            fast = SingleRowPredictor(
+                self._median_booster, len(self.bundle.feature_names), self.num_threads, dtype=np.float64
+            )
+        except Exception as e:  # C API missing / changed in this LightGBM build
+            logger.warning("rent_fast_predict_unavailable", extra={"error": str(e)})
+            self._local.fast = _UNAVAILABLE
+            return None
+        self._local.fast = fast
+        return fast
+
+    def predict_unit_rents(self, units: pd.DataFrame) -> np.ndarray:
+        """
+        Batched predict_unit_rent: one model call for many units.
+
+        `units` has one row per unit with columns bedrooms, bathrooms, sqft,
+        zipcode, property_type (missing numbers -> 0, as in predict_unit_rent).
+        Returns an array of rents aligned with the rows of `units`.
+        """
+        n = len(units)
+
+        def _num(col: str) -> np.ndarray:
+            if col not in units.columns:
+                return np.zeros(n)
+            return units[col].fillna(0.0).to_numpy(dtype=float)
+
+        sqft = _num("sqft")
+        beds = _num("bedrooms")
+
+        if not getattr(self, "is_ready", False) or self.bundle is None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("rent_predict_fallback", extra={"reason": "model_not_ready", "n": n})
+            return np.maximum(1.10 * sqft + 150.0 * beds, 0.0)
+
+        # A batch repeats a handful of zipcodes / types: encode each distinct
+        # string once and broadcast the codes back to the rows.
+        if "zipcode" in units.columns:
+            codes, uniques = pd.factorize(units["zipcode"].astype(str))
+            zip_num = np.array([_zipcode_feature(z) for z in uniques], dtype=float)[codes]
+        else:
+            zip_num = np.zeros(n)
+
+        if "property_type" in units.columns:
+            codes, uniques = pd.factorize(units["property_type"].fillna("").astype(str))
+            is_sfh = np.array([_property_type_feature(t) for t in uniques], dtype=float)[codes]
+        else:
+            is_sfh = np.ones(n)
+
+        columns = {
+            "bedrooms": beds,
+            "bathrooms": _num("bathrooms"),
+            "sqft": sqft,
+            "zipcode": zip_num,
+            "property_type": is_sfh,
+        }
+        zeros = np.zeros(n)
+        X = np.column_stack([columns.get(name, zeros) for name in self.bundle.feature_names])
+        return self._predict_matrix(X, sqft)
+
+    def _predict_matrix(self, X: np.ndarray, sqft: np.ndarray) -> np.ndarray:
+        """
+        Median (alpha=0.5) prediction for a feature matrix, falling back to the
+        mean over all alphas, then to $1.10/sqft if the model call fails.
+        Only rows not already memoized reach the model (distinct rows once);
+        fallback rents are not memoized.
+        """
+        keys = list(map(tuple, X.tolist()))
+        cache = self._rent_cache
+        # snapshot the hits up front: another thread may evict them meanwhile
+        found: Dict[tuple, float] = {}
+        misses: List[tuple] = []
+        for k in dict.fromkeys(keys):
+            rent = cache.get(k)
+            if rent is None:
+                misses.append(k)
+            else:
+                found[k] = rent
+        if misses:
+            try:
+                pred = self._predict_raw(np.array(misses, dtype=float))
+            except Exception as e:
+                logger.warning("rent_predict_exception", extra={"error": str(e)})
+                return np.maximum(1.10 * sqft, 0.0)
+            fresh = dict(zip(misses, np.maximum(pred, 0.0).tolist(), strict=True))
+            found.update(fresh)
+            self._remember(fresh)
+        return np.array([found[k] for k in keys], dtype=float)
+
+    def _predict_raw(self, X: np.ndarray) -> np.ndarray:
+        predictors = self._predictors
+        if 0.5 in predictors:
+            return np.asarray(predictors[0.5](X), dtype=float)
+        preds = [np.asarray(predict(X), dtype=float) for predict in predictors.values()]
+        return np.mean(np.stack(preds), axis=0)
+
+    def _remember(self, fresh: Dict[tuple, float]) -> None:
+        cache = self._rent_cache
+        with self._cache_lock:
+            cache.update(fresh)
+            for k in list(islice(cache, max(len(cache) - _RENT_CACHE_SIZE, 0))):
+                del cache[k]
+
 
-        return max(pred, 0.0)
+def _booster_of(model: Any) -> Any | None:
+    """The fitted LightGBM Booster behind an sklearn LGBM wrapper, else None."""
+    try:
+        return getattr(model, "booster_", None)
+    except Exception:  # sklearn NotFittedError for unfitted wrappers
+        return None
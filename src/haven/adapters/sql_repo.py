@@ -4,7 +4,8 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Iterable, Sequence
 
-from sqlmodel import JSON, Column, Field, Session, SQLModel, create_engine, select
+from sqlalchemy import insert
+from sqlmodel import JSON, Column, Field, Session, SQLModel, col, create_engine, select
 
 
 # ---------- Deals (existing behavior) ----------
@@ -30,9 +31,10 @@ class SqlDealRepository:
         self.engine = create_engine(uri, echo=False)
         SQLModel.metadata.create_all(self.engine)
 
-    def save_analysis(self, analysis: dict[str, Any], request_payload: dict[str, Any]) -> int:
+    @staticmethod
+    def _deal_row(analysis: dict[str, Any], request_payload: dict[str, Any]) -> DealRow:
         addr = analysis.get("address", {})
-        row = DealRow(
+        return DealRow(
             address=addr.get("address", ""),
             city=addr.get("city", ""),
             state=addr.get("state", ""),
@@ -41,12 +43,56 @@ class SqlDealRepository:
             payload=request_payload,
             result=analysis,
         )
+
+    def save_analysis(self, analysis: dict[str, Any], request_payload: dict[str, Any]) -> int:
+        row = self._deal_row(analysis, request_payload)
         with Session(self.engine) as session:
             session.add(row)
             session.commit()
             session.refresh(row)
             return int(row.id)  # type: ignore[arg-type]
 
+    def save_analysis_batch(
+        self, analyses: Sequence[dict[str, Any]], request_payloads: Sequence[dict[str, Any]]
+    ) -> list[int]:
+        """
+        save_analysis for many deals in one transaction. Where the database
+        can return ids from a multi-row INSERT (SQLite >= 3.35, Postgres),
+        rows go in as one parameterized executemany without building ORM
+        objects; otherwise they are added as DealRows and flushed together.
+        """
+        if not self.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+            rows = [self._deal_row(a, p) for a, p in zip(analyses, request_payloads, strict=True)]
+            with Session(self.engine) as session:
+                session.add_all(rows)
+                session.flush()
+                ids = [int(row.id) for row in rows]  # type: ignore[arg-type]
+                session.commit()
+            return ids
+
+        params = []
+        for analysis, request_payload in zip(analyses, request_payloads, strict=True):
+            addr = analysis.get("address", {})
+            params.append(
+                {
+                    "ts": datetime.utcnow(),
+                    "address": addr.get("address", ""),
+                    "city": addr.get("city", ""),
+                    "state": addr.get("state", ""),
+                    "zipcode": addr.get("zipcode", ""),
+                    "property_type": analysis.get("property_type", ""),
+                    "payload": request_payload,
+                    "result": analysis,
+                }
+            )
+        if not params:
+            return []
+        stmt = insert(DealRow).returning(col(DealRow.id), sort_by_parameter_order=True)
+        with Session(self.engine) as session:
+            ids = [int(deal_id) for deal_id in session.execute(stmt, params).scalars()]
+            session.commit()
+        return ids
+
     def get(self, deal_id: int) -> DealRow | None:
         with Session(self.engine) as session:
             return session.get(DealRow, deal_id)
@@ -181,6 +227,30 @@ class SqlPropertyRepository:
             )
         return out
 
+    def search_columns(
+        self,
+        zipcode: str,
+        columns: Sequence[str],
+        max_price: float | None = None,
+        limit: int = 200,
+    ) -> dict[str, list[Any]]:
+        """
+        Same rows as search(), returned column-wise: name -> list of values.
+
+        Only the requested scalar columns are selected, so no PropertyRow
+        objects are built and the raw JSON blob is never decoded. Values are
+        as stored (None stays None, unlike search()'s "" defaults).
+        """
+        cols = [getattr(PropertyRow, name) for name in columns]
+        stmt = select(*cols).where(PropertyRow.zipcode == zipcode)
+        if max_price is not None:
+            stmt = stmt.where(col(PropertyRow.list_price) <= max_price)
+        stmt = stmt.order_by(col(PropertyRow.list_price)).limit(limit)
+        with self.engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        values = list(zip(*rows, strict=True)) if rows else [()] * len(cols)
+        return {name: list(v) for name, v in zip(columns, values, strict=True)}
+
 
 # ---------- Leads + Lead Events ----------
 
@@ -0,0 +1,117 @@
+# src/haven/analysis/_finance_nb.py
+"""
+Scalar underwriting kernel behind analyze_property_financials.
+
+Pure float arithmetic over a fixed set of inputs (see haven.analysis._jit
+for the optional numba compile). The operation order mirrors the original
+dict-based helpers exactly (no fastmath), so results are bit-identical
+with or without numba.
+"""
+from __future__ import annotations
+
+from haven.analysis._jit import jit
+
+
+@jit
+def monthly_mortgage_payment(principal: float, annual_rate: float, years: float) -> float:
+    """
+    Standard fixed-rate amortization formula:
+    M = P * [ r(1+r)^n / ((1+r)^n - 1) ]
+    P = loan principal
+    r = monthly interest rate
+    n = number of payments (months)
+    """
+    r = annual_rate / 12.0
+    n = years * 12.0
+
+    if r == 0:
+        return principal / n
+
+    # float exponent: same pow() as Python's float ** int
+    numerator = r * (1 + r) ** n
+    denom = (1 + r) ** n - 1
+    return principal * (numerator / denom)
+
+
+@jit
+def underwrite(
+    purchase_price: float,
+    down_payment_pct: float,
+    interest_rate_annual: float,
+    loan_term_years: float,
+    taxes_annual: float,
+    insurance_annual: float,
+    hoa_monthly: float,
+    gross_rent_monthly: float,
+    vacancy_rate: float,
+    maintenance_rate: float,
+    property_mgmt_rate: float,
+    capex_rate: float,
+    closing_cost_pct: float,
+) -> tuple[float, float, float, float, float, float, float, float, float, float, float, float, float]:
+    """
+    (down_payment, loan_amount, mortgage_monthly, vacancy_loss_monthly,
+    effective_rent_monthly, operating_expenses_monthly, noi_monthly,
+    noi_annual, cap_rate, dscr, cashflow_monthly_after_debt,
+    cash_on_cash_return, breakeven_occupancy_pct) for one property.
+    """
+    # --- financing basics ---
+    down_payment = purchase_price * down_payment_pct
+    loan_amount = purchase_price - down_payment
+    mortgage_monthly = monthly_mortgage_payment(loan_amount, interest_rate_annual, loan_term_years)
+
+    # --- income side: vacancy applied to gross rent ---
+    vacancy_loss = gross_rent_monthly * vacancy_rate
+    effective = gross_rent_monthly - vacancy_loss
+
+    # --- operating expenses (no mortgage: financing, not operations) ---
+    # maintenance, management, capex reserves, taxes, insurance, HOA
+    maint = effective * maintenance_rate
+    mgmt = effective * property_mgmt_rate
+    capex = effective * capex_rate
+    total_op = maint + mgmt + capex + taxes_annual / 12.0 + insurance_annual / 12.0 + hoa_monthly
+
+    # --- NOI: income after vacancy + operating expenses, BEFORE debt ---
+    noi_monthly = effective - total_op
+    noi_annual = noi_monthly * 12.0
+
+    annual_debt_service = mortgage_monthly * 12.0
+
+    # --- DSCR (lenders like >= ~1.20 for small multifamily/commercial) ---
+    dscr = 0.0
+    if annual_debt_service > 0:
+        dscr = noi_annual / annual_debt_service
+
+    # --- Cap rate = NOI / purchase price ---
+    cap_rate = 0.0
+    if purchase_price > 0:
+        cap_rate = noi_annual / purchase_price
+
+    cashflow = effective - total_op - mortgage_monthly
+
+    # --- Cash on cash: annual cash flow / (down payment + closing costs) ---
+    total_cash_in = down_payment + purchase_price * closing_cost_pct
+    cash_on_cash = 0.0
+    if total_cash_in > 0:
+        cash_on_cash = (cashflow * 12.0) / total_cash_in
+
+    # --- Breakeven occupancy: share of gross rent needed to not lose money ---
+    breakeven_occ = 0.0
+    if gross_rent_monthly > 0:
+        breakeven_occ = (total_op + mortgage_monthly) / gross_rent_monthly
+
+    return (
+        down_payment,
+        loan_amount,
+        mortgage_monthly,
+        vacancy_loss,
+        effective,
+        total_op,
+        noi_monthly,
+        noi_annual,
+        cap_rate,
+        dscr,
+        cashflow,
+        cash_on_cash,
+        breakeven_occ,
+    )
@@ -0,0 +1,26 @@
+# src/haven/analysis/_jit.py
+"""
+Optional numba JIT for the scalar kernels in haven.analysis (_finance_nb,
+_scoring_nb). numba is not a hard dependency: without it the decorated
+functions run as plain Python.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
+
+try:
+    from numba import njit  # optional; not a hard dependency
+except ImportError:  # pragma: no cover - exercised when numba is absent
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def jit(fn: F) -> F:
+    """numba njit(cache=True) when numba is installed, else fn unchanged."""
+    if njit is None:
+        return fn
+    return cast(F, njit(cache=True)(fn))
@@ -0,0 +1,122 @@
+# src/haven/analysis/_scoring_nb.py
+"""
+Scoring kernel behind score_property / score_properties_batch.
+
+compute_rank holds the /top-deals scoring rules as pure float arithmetic
+(see haven.analysis._jit for the optional numba compile); the vectorized
+score_properties_batch must agree with it. Imported lazily by
+haven.analysis.scoring so unrelated entrypoints never pay for importing /
+compiling numba.
+"""
+from __future__ import annotations
+
+import math
+
+from haven.analysis._jit import jit
+
+# strategy codes
+STRATEGY_HOLD = 0
+STRATEGY_FLIP = 1
+
+
+@jit
+def compute_rank(
+    strategy_code: int,
+    cashflow: float,
+    coc: float,
+    dscr: float,
+    breakeven: float,
+    dom: float,
+    size: float,
+    year: float,
+    rent_q10: float,
+    arv_q10: float,
+    arv_q50: float,
+    flip_p: float,
+) -> tuple[float, int]:
+    """
+    (rank_score, label code) for one deal; the code indexes scoring._LABELS.
+    flip_p is NaN when no flip probability is available.
+    """
+    is_flip = strategy_code == STRATEGY_FLIP
+
+    coc_component = max(min(coc * 100.0, 40.0), -40.0)
+
+    if dscr <= 0:
+        dscr_component = -40.0
+    elif dscr < 1.0:
+        dscr_component = -30.0
+    else:
+        dscr_component = max(min((dscr - 1.0) * 25.0, 25.0), -30.0)
+
+    if breakeven <= 0:
+        breakeven_component = -10.0
+    else:
+        breakeven_component = max(-max((breakeven - 0.90) * 200.0, 0.0), -20.0)
+
+    dom_component = 0.0
+    if dom > 45:
+        dom_component = -(min(dom - 45.0, 180.0) * 0.10)
+    if is_flip and dom_component < 0.0:
+        dom_component = dom_component * 1.5
+
+    size_component = 0.0
+    tiny_unit_flag = False
+    if size > 0:
+        if size < 450:
+            size_component = -40.0
+            tiny_unit_flag = True
+        elif size < 600:
+            size_component = -25.0
+
+    age_component = 0.0
+    if year > 0 and year < 1960:
+        age_component = -15.0
+
+    downside_component = 0.0
+    if arv_q10 > 0 and arv_q50 > 0:
+        downside_ratio = arv_q10 / max(arv_q50, 1e-9)
+        if downside_ratio < 0.9:
+            downside_component = -((0.9 - downside_ratio) * 40.0)
+    if rent_q10 > 0 and cashflow < 0 and coc < 0.03:
+        downside_component = downside_component - 15.0
+    if is_flip and downside_component < 0.0:
+        downside_component = downside_component * 1.3
+
+    flip_component = 0.0
+    if not math.isnan(flip_p):
+        flip_component = (flip_p - 0.5) * 40.0
+        if not is_flip:
+            flip_component = flip_component * 0.4
+
+    rank_score = (
+        coc_component
+        + dscr_component
+        + breakeven_component
+        + dom_component
+        + size_component
+        + age_component
+        + downside_component
+        + flip_component
+    )
+
+    if cashflow < 0 or dscr < 1.0 or tiny_unit_flag:
+        rank_score = min(rank_score, -25.0)
+    rank_score = max(min(rank_score, 100.0), -100.0)
+
+    if cashflow < 0:
+        code = 0
+    elif dscr < 1.0:
+        code = 1
+    elif tiny_unit_flag:
+        code = 2
+    elif rank_score >= 40:
+        code = 3
+    elif rank_score >= 15:
+        code = 4
+    elif rank_score >= 0:
+        code = 5
+    else:
+        code = 6
+    return rank_score, code
+
@@ -1,8 +1,10 @@
 # src/haven/analysis/scoring.py
 from __future__ import annotations
 
+import math
 from typing import Dict, Mapping, Optional
 
+import numpy as np
 
 # =====================================================================
 # Legacy/simple scoring used by some tests or callers
@@ -74,29 +76,64 @@ def _coalesce_quantile(q: Mapping[str, float] | None, key: str, default: float =
     return float(v) if v is not None else default
 
 
-def _label_from_score(
-    score: float,
-    dscr: float,
-    coc: float,
-    cashflow: float,
-    tiny_unit_flag: bool,
-) -> tuple[str, str]:
+# (label, reason) per label code of _label_index_from_score / _scoring_nb.compute_rank,
+# in priority order.
+_LABELS: tuple[tuple[str, str], ...] = (
     # Hard fails first
-    if cashflow < 0:
-        return "pass", "Negative cashflow in base case."
-    if dscr < 1.0:
-        return "pass", "DSCR < 1.0; cannot safely service debt."
-    if tiny_unit_flag:
-        return "pass", "Unit is extremely small; likely illiquid and operationally fragile."
-
+    ("pass", "Negative cashflow in base case."),
+    ("pass", "DSCR < 1.0; cannot safely service debt."),
+    ("pass", "Unit is extremely small; likely illiquid and operationally fragile."),
     # Interpret by score bands
-    if score >= 40:
-        return "buy", "High risk-adjusted score with strong coverage and returns."
-    if score >= 15:
-        return "buy", "Attractive profile; meets target safety and return thresholds."
-    if score >= 0:
-        return "maybe", "Workable but requires deeper underwriting or better terms."
-    return "pass", "Risk/return profile is not compelling versus alternatives."
+    ("buy", "High risk-adjusted score with strong coverage and returns."),
+    ("buy", "Attractive profile; meets target safety and return thresholds."),
+    ("maybe", "Workable but requires deeper underwriting or better terms."),
+    ("pass", "Risk/return profile is not compelling versus alternatives."),
+)
+
+
+def _label_index_from_score(
+    score: np.ndarray,
+    dscr: np.ndarray,
+    cashflow: np.ndarray,
+    tiny_unit_flag: np.ndarray,
+) -> np.ndarray:
+    """Index into _LABELS for each deal: first matching rule wins."""
+    return np.select(
+        [cashflow < 0, dscr < 1.0, tiny_unit_flag, score >= 40, score >= 15, score >= 0],
+        [0, 1, 2, 3, 4, 5],
+        default=6,
+    )
+
+
+# score_property_inputs row: (cashflow, coc, dscr, breakeven, dom, size, year, rent_q10, arv_q10, arv_q50)
+ScoreInputs = tuple[float, float, float, float, float, float, float, float, float, float]
+
+
+def score_property_inputs(
+    finance: Mapping[str, float],
+    arv_q: Optional[Mapping[str, float]] = None,
+    rent_q: Optional[Mapping[str, float]] = None,
+    dom: float | None = None,
+    sqft: float | None = None,
+    year_built: float | None = None,
+) -> ScoreInputs:
+    """
+    Scalar inputs of score_property, in score_properties_batch column order:
+    (cashflow, coc, dscr, breakeven, dom, size, year, rent_q10, arv_q10, arv_q50).
+    """
+    return (
+        float(finance.get("cashflow_monthly_after_debt", 0.0)),
+        float(finance.get("cash_on_cash_return", 0.0)),
+        float(finance.get("dscr", 0.0)),
+        float(finance.get("breakeven_occupancy_pct", 1.0)),
+        float(dom or finance.get("days_on_market", 0.0) or 0.0),
+        float(sqft or finance.get("sqft", 0.0) or 0.0),
+        float(year_built or finance.get("year_built", 0.0) or 0.0),
+        # Downside signals from quantiles (if present)
+        _coalesce_quantile(rent_q, "q10", default=0.0),
+        _coalesce_quantile(arv_q, "q10", default=0.0),
+        _coalesce_quantile(arv_q, "q50", default=0.0),
+    )
 
 
 def score_property(
@@ -128,98 +165,109 @@ def score_property(
         "label": "buy" | "maybe" | "pass",
         "reason": str,
       }
+
+    Single deals go through the scalar kernel in _scoring_nb (numba-compiled
+    when available); score_properties_batch is the vectorized equivalent.
     """
-    cashflow = float(finance.get("cashflow_monthly_after_debt", 0.0))
-    coc = float(finance.get("cash_on_cash_return", 0.0))
-    dscr = float(finance.get("dscr", 0.0))
-    breakeven = float(finance.get("breakeven_occupancy_pct", 1.0))
+    from haven.analysis import _scoring_nb
 
-    dom = float(dom or finance.get("days_on_market", 0.0) or 0.0)
+    rank_score, code = _scoring_nb.compute_rank(
+        _scoring_nb.STRATEGY_FLIP if strategy == "flip" else _scoring_nb.STRATEGY_HOLD,
+        *score_property_inputs(finance, arv_q, rent_q, dom, sqft, year_built),
+        math.nan if flip_p_good is None else float(flip_p_good),
+    )
+    label, reason = _LABELS[code]
+    return {
+        "rank_score": float(rank_score),
+        "label": label,
+        "reason": reason,
+    }
 
-    size = float(sqft or finance.get("sqft", 0.0) or 0.0)
-    year = float(year_built or finance.get("year_built", 0.0) or 0.0)
 
-    # Downside signals from quantiles (if present)
-    rent_q10 = _coalesce_quantile(rent_q, "q10", default=0.0)
-    arv_q10 = _coalesce_quantile(arv_q, "q10", default=0.0)
-    arv_q50 = _coalesce_quantile(arv_q, "q50", default=0.0)
+def score_properties_batch(
+    inputs: np.ndarray,
+    strategy: np.ndarray,
+    flip_p_good: np.ndarray,
+) -> list[Dict[str, object]]:
+    """
+    Vectorized score_property over N deals.
+
+    inputs: (N, 10) float array of score_property_inputs rows.
+    strategy: (N,) array of "hold" / "flip".
+    flip_p_good: (N,) float array, NaN where no flip probability is available.
+    """
+    (
+        cashflow, coc, dscr, breakeven, dom, size, year, rent_q10, arv_q10, arv_q50
+    ) = np.asarray(inputs, dtype=float).T
+    is_flip = np.asarray(strategy) == "flip"
+    flip_p = np.asarray(flip_p_good, dtype=float)
 
     # ---------------- Base components ----------------
 
     # CoC: treat each percentage point as one score unit up to 40%, then clamp.
     coc_pct = coc * 100.0
-    coc_component = max(min(coc_pct, 40.0), -40.0)
+    coc_component = np.clip(coc_pct, -40.0, 40.0)
 
     # DSCR: reward strength above 1.0, with diminishing returns after ~2.0
-    if dscr <= 0:
-        dscr_component = -40.0
-    elif dscr < 1.0:
-        dscr_component = -30.0
-    else:
-        dscr_component = (dscr - 1.0) * 25.0  # DSCR 1.4 → +10
-        dscr_component = max(min(dscr_component, 25.0), -30.0)
+    # (DSCR 1.4 → +10)
+    dscr_component = np.where(
+        dscr <= 0,
+        -40.0,
+        np.where(dscr < 1.0, -30.0, np.clip((dscr - 1.0) * 25.0, -30.0, 25.0)),
+    )
 
     # Breakeven occupancy: punish fragile deals
-    if breakeven <= 0:
-        breakeven_component = -10.0
-    else:
-        breakeven_component = -max((breakeven - 0.90) * 200.0, 0.0)
-        breakeven_component = max(breakeven_component, -20.0)
+    breakeven_component = np.where(
+        breakeven <= 0,
+        -10.0,
+        np.maximum(-np.maximum((breakeven - 0.90) * 200.0, 0.0), -20.0),
+    )
 
-    # DOM: stale listings might hide issues
-    dom_component = 0.0
-    if dom > 45:
-        dom_component = -(min(dom - 45.0, 180.0) * 0.10)  # up to about -13.5
+    # DOM: stale listings might hide issues (up to about -13.5)
+    dom_component = np.where(dom > 45, -(np.minimum(dom - 45.0, 180.0) * 0.10), 0.0)
 
     # For flips, we care more about liquidity – increase DOM penalty
-    if strategy == "flip" and dom_component < 0.0:
-        dom_component *= 1.5
+    dom_component = np.where(is_flip & (dom_component < 0.0), dom_component * 1.5, dom_component)
 
     # Tiny square footage penalties
-    size_component = 0.0
-    tiny_unit_flag = False
-    if size > 0:
-        if size < 450:
-            size_component -= 40.0
-            tiny_unit_flag = True
-        elif size < 600:
-            size_component -= 25.0
+    tiny_unit_flag = (size > 0) & (size < 450)
+    size_component = np.where(tiny_unit_flag, -40.0, np.where((size > 0) & (size < 600), -25.0, 0.0))
 
     # Old homes penalty – more likely to have capex and surprise rehab
-    age_component = 0.0
-    if year > 0 and year < 1960:
-        age_component = -15.0
+    age_component = np.where((year > 0) & (year < 1960), -15.0, 0.0)
 
     # ---------------- Downside risk adjustments ----------------
 
-    downside_component = 0.0
-
     # If ARV downside (q10) is far below median, increase caution.
-    if arv_q10 > 0 and arv_q50 > 0:
-        downside_ratio = arv_q10 / max(arv_q50, 1e-9)
-        if downside_ratio < 0.9:
-            downside_component -= (0.9 - downside_ratio) * 40.0  # up to about -40
+    with np.errstate(divide="ignore", invalid="ignore"):
+        downside_ratio = arv_q10 / np.maximum(arv_q50, 1e-9)
+    downside_component = np.where(
+        (arv_q10 > 0) & (arv_q50 > 0) & (downside_ratio < 0.9),
+        -((0.9 - downside_ratio) * 40.0),  # up to about -40
+        0.0,
+    )
 
     # If rent downside is very weak, also penalize
-    if rent_q10 > 0:
-        # Crude: if q10 rent would not cover op ex + debt → big penalty.
-        # We don't recompute full mortgage here; this is a soft heuristic.
-        if cashflow < 0 and coc < 0.03:
-            downside_component -= 15.0
+    # Crude: if q10 rent would not cover op ex + debt → big penalty.
+    # We don't recompute full mortgage here; this is a soft heuristic.
+    downside_component = np.where(
+        (rent_q10 > 0) & (cashflow < 0) & (coc < 0.03),
+        downside_component - 15.0,
+        downside_component,
+    )
 
     # For flips, we care more about downside on ARV & rent
-    if strategy == "flip" and downside_component < 0.0:
-        downside_component *= 1.3
+    downside_component = np.where(
+        is_flip & (downside_component < 0.0), downside_component * 1.3, downside_component
+    )
 
     # ---------------- Flip classifier overlay (optional) ----------------
 
-    flip_component = 0.0
-    if flip_p_good is not None:
-        # Center at 0.5 -> neutral; more confident good/bad moves the score.
-        flip_component = (float(flip_p_good) - 0.5) * 40.0
-        # Only strongly applied if strategy hints "flip"
-        if strategy != "flip":
-            flip_component *= 0.4  # dampen for hold scenarios
+    # Center at 0.5 -> neutral; more confident good/bad moves the score.
+    # Only strongly applied if strategy hints "flip" (dampened for hold).
+    flip_component = (flip_p - 0.5) * 40.0
+    flip_component = np.where(is_flip, flip_component, flip_component * 0.4)
+    flip_component = np.where(np.isnan(flip_p), 0.0, flip_component)
 
     # ---------------- Aggregate & clamp ----------------
 
@@ -235,26 +283,23 @@ def score_property(
     )
 
     # Hard overrides from cashflow / DSCR / tiny units
-    if cashflow < 0:
-        rank_score = min(rank_score, -25.0)
-    if dscr < 1.0:
-        rank_score = min(rank_score, -25.0)
-    if tiny_unit_flag:
-        rank_score = min(rank_score, -25.0)
+    rank_score = np.where((cashflow < 0) | (dscr < 1.0) | tiny_unit_flag, np.minimum(rank_score, -25.0), rank_score)
 
     # Clamp for stability
-    rank_score = max(min(rank_score, 100.0), -100.0)
+    rank_score = np.maximum(np.minimum(rank_score, 100.0), -100.0)
 
-    label, reason = _label_from_score(
+    label_idx = _label_index_from_score(
         score=rank_score,
         dscr=dscr,
-        coc=coc,
         cashflow=cashflow,
         tiny_unit_flag=tiny_unit_flag,
     )
 
-    return {
-        "rank_score": float(rank_score),
-        "label": label,
-        "reason": reason,
-    }
+    return [
+        {
+            "rank_score": float(score),
+            "label": _LABELS[i][0],
+            "reason": _LABELS[i][1],
+        }
+        for score, i in zip(rank_score.tolist(), label_idx.tolist(), strict=True)
+    ]
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import math
 import os
+import re
 from collections.abc import Sequence
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
@@ -20,7 +21,7 @@ from haven.adapters.sql_repo import (
     SqlLeadRepository,
     SqlPropertyRepository,
 )
-from haven.services.deal_analyzer import analyze_deal
+from haven.services.deal_analyzer import analyze_deal, analyze_deals_batch
 from .schemas import AnalyzeRequest, AnalyzeResponse, TopDealItem, LeadItem, LeadEventCreate
 
 app = FastAPI()
@@ -92,6 +93,9 @@ _EXCLUDED_UPSTREAM_TYPES = {
     "lot",
     "vacant land",
 }
+_EXCLUDED_TYPE_RE = re.compile(
+    "|".join(re.escape(bad) for bad in sorted(_EXCLUDED_UPSTREAM_TYPES, key=len, reverse=True))
+)
 
 
 def _detect_excluded_property_type(prop_rec: dict[str, Any]) -> str | None:
@@ -105,32 +109,13 @@ def _detect_excluded_property_type(prop_rec: dict[str, Any]) -> str | None:
     if not t:
         return None
 
-    for bad in _EXCLUDED_UPSTREAM_TYPES:
-        if bad in t:
-            return str(pt)
+    if _EXCLUDED_TYPE_RE.search(t):
+        return str(pt)
     return None
 
 
-def _compute_lead_preview(prop_rec: dict[str, Any], *, strategy: str = "rental") -> dict[str, Any]:
-    """
-    Compute underwriting preview ONCE per property and turn it into a lead score.
-
-    CRITICAL FIXES:
-    - Runs analyzer in PREVIEW mode: repo=None, save=False
-      (prevents sqlite lock + makes bulk scoring fast)
-    - Excludes unwanted property types up-front
-    - Returns 'reason' always, so UI can explain why score is 0
-
-    Returns fields that should be stored on the lead:
-      lead_score, dscr, cash_on_cash_return, rank_score, label, reason
-    """
-    if not prop_rec.get("list_price"):
-        return {"lead_score": 0.0, "reason": "missing list_price"}
-
-    excluded = _detect_excluded_property_type(prop_rec)
-    if excluded:
-        return {"lead_score": 0.0, "reason": f"excluded property_type: {excluded}"}
-
+def _lead_payload(prop_rec: dict[str, Any], *, strategy: str) -> dict[str, Any]:
+    """Analyzer payload for a property record (preview analysis)."""
     raw = prop_rec.get("raw") or {}
     dom_raw = raw.get("daysOnZillow") or raw.get("dom") or raw.get("days_on_market") or 0.0
     try:
@@ -138,8 +123,7 @@ def _compute_lead_preview(prop_rec: dict[str, Any], *, strategy: str = "rental")
     except Exception:
         dom = 0.0
 
-    # Build analyzer payload
-    payload: dict[str, Any] = {
+    return {
         "address": prop_rec.get("address", "") or "",
         "city": prop_rec.get("city", "") or "",
         "state": prop_rec.get("state", "") or "",
@@ -160,15 +144,22 @@ def _compute_lead_preview(prop_rec: dict[str, Any], *, strategy: str = "rental")
         "raw": raw,
     }
 
-    try:
-        analysis = analyze_deal(
-            raw_payload=payload,
-            rent_estimator=_rent_estimator or LightGBMRentEstimator(),
-            repo=None,       # PREVIEW MODE: do not write deals
-            save=False,      # PREVIEW MODE
-        )
-    except Exception as e:
-        return {"lead_score": 0.0, "reason": f"analyze_deal failed: {e}"}
+
+def _skip_reason(prop_rec: dict[str, Any]) -> str | None:
+    """Why a property gets a zero preview without running the analyzer, else None."""
+    if not prop_rec.get("list_price"):
+        return "missing list_price"
+
+    excluded = _detect_excluded_property_type(prop_rec)
+    if excluded:
+        return f"excluded property_type: {excluded}"
+    return None
+
+
+def _lead_preview_from_analysis(analysis: dict[str, Any], payload: dict[str, Any]) -> dict[str, Any]:
+    """Turn an analyzer result into the lead preview fields."""
+    dom = payload["days_on_market"]
+    strategy = payload["strategy"]
 
     finance = analysis.get("finance", {}) or {}
     score = analysis.get("score", {}) or {}
@@ -229,12 +220,82 @@ def _compute_lead_preview(prop_rec: dict[str, Any], *, strategy: str = "rental")
     }
 
 
+def _compute_lead_preview(prop_rec: dict[str, Any], *, strategy: str = "rental") -> dict[str, Any]:
+    """
+    Compute underwriting preview ONCE per property and turn it into a lead score.
+
+    CRITICAL FIXES:
+    - Runs analyzer in PREVIEW mode: repo=None, save=False
+      (prevents sqlite lock + makes bulk scoring fast)
+    - Excludes unwanted property types up-front
+    - Returns 'reason' always, so UI can explain why score is 0
+
+    Returns fields that should be stored on the lead:
+      lead_score, dscr, cash_on_cash_return, rank_score, label, reason
+    """
+    skip = _skip_reason(prop_rec)
+    if skip:
+        return {"lead_score": 0.0, "reason": skip}
+
+    payload = _lead_payload(prop_rec, strategy=strategy)
+    try:
+        analysis = analyze_deal(
+            raw_payload=payload,
+            rent_estimator=_rent_estimator or LightGBMRentEstimator(),
+            repo=None,       # PREVIEW MODE: do not write deals
+            save=False,      # PREVIEW MODE
+        )
+    except Exception as e:
+        return {"lead_score": 0.0, "reason": f"analyze_deal failed: {e}"}
+
+    return _lead_preview_from_analysis(analysis, payload)
+
+
+def _compute_lead_previews(prop_recs: list[dict[str, Any]], *, strategy: str = "rental") -> list[dict[str, Any]]:
+    """
+    _compute_lead_preview for many properties with one analyze_deals_batch
+    call, so rent, ARV and flip models each run once per batch.
+
+    The batch raises on the first invalid payload; in that case the batch is
+    redone property by property so each failure gets its own reason.
+    """
+    previews: dict[int, dict[str, Any]] = {}
+    payloads: list[dict[str, Any]] = []
+    slots: list[int] = []
+    for i, p in enumerate(prop_recs):
+        skip = _skip_reason(p)
+        if skip:
+            previews[i] = {"lead_score": 0.0, "reason": skip}
+            continue
+        payloads.append(_lead_payload(p, strategy=strategy))
+        slots.append(i)
+
+    try:
+        analyses = analyze_deals_batch(
+            payloads,
+            rent_estimator=_rent_estimator or LightGBMRentEstimator(),
+            repo=None,       # PREVIEW MODE: do not write deals
+            save=False,      # PREVIEW MODE
+        )
+    except Exception:
+        for i in slots:
+            previews[i] = _compute_lead_preview(prop_recs[i], strategy=strategy)
+    else:
+        for i, payload, analysis in zip(slots, payloads, analyses, strict=True):
+            previews[i] = _lead_preview_from_analysis(analysis, payload)
+
+    return [previews[i] for i in range(len(prop_recs))]
+
+
 # -----------------------------
 # LEADS: endpoints
 # -----------------------------
+_LEAD_PREVIEW_BATCH = 256
+
+
 @app.post("/leads/from-properties")
 def leads_from_properties(
-    zip: str = Query(..., alias="zip"),
+    zipcode: str = Query(..., alias="zip"),
     max_price: float | None = Query(None),
     limit: int = Query(300, ge=1, le=2000),
     strategy: str = Query("rental", description="rental|flip (used for preview analysis)"),
@@ -244,19 +305,20 @@ def leads_from_properties(
     Convert properties in core.properties (already ingested) into leads.
 
     SPEED + STABILITY CHANGES:
-    - We compute previews in parallel (thread pool).
+    - We compute previews in batches (one analyze_deals_batch call each),
+      with batches run in parallel (thread pool).
     - Preview analysis does NOT write to deals DB (repo=None, save=False).
       This prevents sqlite lock storms and makes /leads/from-properties much faster.
 
     Flow:
     1) Load properties
-    2) Compute preview for each property (parallel)
+    2) Compute previews batch by batch (parallel)
     3) Upsert leads using precomputed preview fields (single DB writer)
     """
     t0 = datetime.utcnow()
 
     try:
-        props = _property_repo.search(zipcode=zip, max_price=max_price, limit=limit)
+        props = _property_repo.search(zipcode=zipcode, max_price=max_price, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"property search failed: {e}") from e
 
@@ -277,28 +339,30 @@ def leads_from_properties(
             return f"{source}::{ext}"
         return f"{source}::{str(p.get('address') or '').strip()}::{str(p.get('zipcode') or '').strip()}"
 
+    analyzable: list[dict[str, Any]] = []
+    for p in props:
+        # early exclusion shortcut (so we don't even submit to executor)
+        excluded_pt = _detect_excluded_property_type(p)
+        if excluded_pt:
+            excluded += 1
+            preview_by_key[_lead_key(p)] = {"lead_score": 0.0, "reason": f"excluded property_type: {excluded_pt}"}
+            continue
+        analyzable.append(p)
+
+    # Each worker scores a whole batch (one model call per batch, not per property)
+    batches = [analyzable[i : i + _LEAD_PREVIEW_BATCH] for i in range(0, len(analyzable), _LEAD_PREVIEW_BATCH)]
     with ThreadPoolExecutor(max_workers=workers) as ex:
-        futures = {}
-        for p in props:
-            key = _lead_key(p)
-
-            # early exclusion shortcut (so we don't even submit to executor)
-            excluded_pt = _detect_excluded_property_type(p)
-            if excluded_pt:
-                excluded += 1
-                preview_by_key[key] = {"lead_score": 0.0, "reason": f"excluded property_type: {excluded_pt}"}
-                continue
-
-            futures[ex.submit(_compute_lead_preview, p, strategy=strategy)] = key
+        futures = {ex.submit(_compute_lead_previews, batch, strategy=strategy): batch for batch in batches}
 
         for fut in as_completed(futures):
-            key = futures[fut]
+            batch = futures[fut]
             try:
-                preview = fut.result()
+                previews = fut.result()
             except Exception as e:
-                failed += 1
-                preview = {"lead_score": 0.0, "reason": f"preview worker failed: {e}"}
-            preview_by_key[key] = preview
+                failed += len(batch)
+                previews = [{"lead_score": 0.0, "reason": f"preview worker failed: {e}"} for _ in batch]
+            for p, preview in zip(batch, previews, strict=True):
+                preview_by_key[_lead_key(p)] = preview
 
     # Now do a single writer pass into sqlite
     def _preview_fn(p: dict[str, Any]) -> dict[str, Any]:
@@ -316,7 +380,7 @@ def leads_from_properties(
 
     # stats currently contains created/updated from repo; add preview telemetry
     return {
-        "zip": zip,
+        "zip": zipcode,
         "count_properties": len(props),
         "workers": workers,
         "strategy": strategy,
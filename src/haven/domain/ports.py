@@ -56,6 +56,16 @@ class DealRepository(Protocol):
         ...
 
 
+class BatchDealRepository(DealRepository, Protocol):
+    """
+    Optional extension: repositories that can persist many analyses in one
+    transaction. Returns the new deal ids aligned with `analyses`.
+    """
+
+    def save_analysis_batch(self, analyses: list[dict[str, Any]], payloads: list[dict[str, Any]]) -> list[int]:
+        ...
+
+
 # ----------------------------
 # Rent estimator interface (standardized)
 # ----------------------------
@@ -76,6 +86,17 @@ class RentEstimator(Protocol):
         ...
 
 
+class BatchRentEstimator(RentEstimator, Protocol):
+    """
+    Optional extension: estimators that can price many units in one call.
+    `units` holds one row per unit with bedrooms, bathrooms, sqft, zipcode,
+    property_type columns; returns rents aligned with its rows.
+    """
+
+    def predict_unit_rents(self, units: Any) -> Any:
+        ...
+
+
 # ----------------------------
 # Leads
 # ----------------------------
@@ -1,6 +1,9 @@
+from dataclasses import dataclass
 from typing import Literal
 
+import numpy as np
 from pydantic import BaseModel, Field, validator
+from pydantic.dataclasses import dataclass as pydantic_dataclass
 
 # All asset classes we support
 PropertyType = Literal[
@@ -11,12 +14,94 @@ PropertyType = Literal[
     "apartment_complex"
 ]
 
-class Unit(BaseModel):
+@pydantic_dataclass(slots=True)
+class Unit:
+    """
+    One rentable unit. A slotted pydantic dataclass rather than a BaseModel:
+    fields are still validated on construction (Property(units=[{...}])
+    works as before), but assignments such as `u.market_rent = rent` in the
+    rent-fill loops are plain slot writes instead of BaseModel.__setattr__.
+    """
+
     bedrooms: float | None = None
     bathrooms: float | None = None
     sqft: float | None = None
     market_rent: float | None = None  # expected achievable rent for this unit
 
+
+@dataclass(slots=True)
+class UnitsTable:
+    """
+    Columnar (structure-of-arrays) view of the units of one or more
+    properties: one float64 array per Unit field, NaN where the field is
+    None, rows grouped by property with `offsets` giving each property's
+    first row. `units` keeps the source Unit objects row-aligned so filled
+    values can be written back.
+    """
+
+    bedrooms: np.ndarray
+    bathrooms: np.ndarray
+    sqft: np.ndarray
+    market_rent: np.ndarray
+    offsets: np.ndarray
+    units: list[Unit]
+
+    @classmethod
+    def from_units(cls, units: list[Unit]) -> "UnitsTable":
+        return cls.from_unit_lists([units])
+
+    @classmethod
+    def from_unit_lists(cls, unit_lists: list[list[Unit]]) -> "UnitsTable":
+        """One table for several properties' units (each list non-empty)."""
+        units = [u for unit_list in unit_lists for u in unit_list]
+        n = len(units)
+
+        def column(field: str) -> np.ndarray:
+            values = (getattr(u, field) for u in units)
+            return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=n)
+
+        offsets = np.zeros(len(unit_lists), dtype=np.intp)
+        np.cumsum([len(unit_list) for unit_list in unit_lists[:-1]], out=offsets[1:])
+        return cls(
+            bedrooms=column("bedrooms"),
+            bathrooms=column("bathrooms"),
+            sqft=column("sqft"),
+            market_rent=column("market_rent"),
+            offsets=offsets,
+            units=units,
+        )
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def owners(self) -> np.ndarray:
+        """Row -> index of the property (unit list) it belongs to."""
+        counts = np.diff(np.append(self.offsets, len(self.units)))
+        return np.repeat(np.arange(len(self.offsets)), counts)
+
+    def missing_rent_mask(self, floor: float = 50.0) -> np.ndarray:
+        """Rows whose market_rent is unset, NaN or <= floor (not a real rent)."""
+        return ~(self.market_rent > floor)
+
+    def set_rents(self, rows: np.ndarray, rents: np.ndarray) -> None:
+        """Fill market_rent for `rows`, in the table and on the Unit objects."""
+        self.market_rent[rows] = rents
+        for i, rent in zip(rows.tolist(), self.market_rent[rows].tolist(), strict=True):
+            self.units[i].market_rent = rent
+
+    def reload_rents(self, rows: np.ndarray) -> None:
+        """Re-read market_rent for `rows` from the Unit objects (after filling them directly)."""
+        for i in rows.tolist():
+            rent = self.units[i].market_rent
+            self.market_rent[i] = np.nan if rent is None else rent
+
+    def rent_totals(self) -> np.ndarray:
+        """Gross monthly rent per property (unset rents count as 0)."""
+        if not len(self.units):
+            return np.zeros(len(self.offsets))
+        return np.add.reduceat(np.nan_to_num(self.market_rent, nan=0.0), self.offsets)
+
+
 class Property(BaseModel):
     property_type: PropertyType
 
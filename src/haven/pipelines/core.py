@@ -5,10 +5,10 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Sequence, Dict, Any
 
-import json
 import subprocess
 import sys
 
+import orjson
 from loguru import logger
 
 
@@ -18,11 +18,35 @@ PROCESSED_DIR = DATA_DIR / "processed"
 REPORTS_DIR = DATA_DIR / "reports"
 MODELS_DIR = Path("models")
 
+# Report JSON: pretty-printed, numpy scalars/arrays serialized natively.
+_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+
 
 # ---------------------------
 # 1. DATA REFRESH (stub for now)
 # ---------------------------
 
+def _run_streaming(cmd: list[str], shard: Sequence[str]) -> int:
+    """
+    Run a child process and forward its output to the logger line by line,
+    so progress shows up while it runs rather than in bulk at exit.
+
+    stderr is merged into stdout: draining two pipes one after the other can
+    deadlock once the unread one fills its OS buffer.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        logger.info("[ingest {}] {}", ",".join(shard), line.rstrip())
+    return proc.wait()
+
+
 def refresh_data(
     zipcodes: Sequence[str],
     max_price: float | None = None,
@@ -34,34 +58,81 @@ def refresh_data(
     For now this is a thin wrapper around the existing CLI script
     `scripts/ingest_properties_parallel.py`.
 
-    This keeps imports simple (no missing haven.services.ingest),
-    and lets the pipeline call the same thing you'd type by hand.
+    ZIPs are split into min(workers, len(zipcodes)) shards and each shard
+    runs as its own child process (with --workers 1), so one bad ZIP only
+    fails its shard and the others still land. Raises CalledProcessError
+    after all shards finish if any of them failed.
+
+    The children only fetch (--out: listings go to a JSON-lines file per
+    shard); this process then upserts every shard's listings, one shard at
+    a time, so the SQLite DB only ever has a single writer.
     """
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    from haven.adapters.config import config
+    from haven.adapters.sql_repo import SqlPropertyRepository
+
+    zipcodes = list(zipcodes)
     logger.info(
         "Starting data refresh via scripts/ingest_properties_parallel.py",
-        zipcodes=list(zipcodes),
+        zipcodes=zipcodes,
         max_price=max_price,
         workers=workers,
     )
+    if not zipcodes:
+        logger.info("Data refresh skipped: no zipcodes")
+        return
+
+    n_shards = max(1, min(workers, len(zipcodes)))
+    shards = [zipcodes[i::n_shards] for i in range(n_shards)]
+
+    def _shard_cmd(shard: list[str], out: Path) -> list[str]:
+        # python -u scripts/ingest_properties_parallel.py --workers 1 --out ... --zip ...
+        # (-u: unbuffered, otherwise the child block-buffers into the pipe)
+        cmd = [
+            sys.executable,
+            "-u",
+            "scripts/ingest_properties_parallel.py",
+            "--workers",
+            "1",
+            "--out",
+            str(out),
+        ]
+        if max_price is not None:
+            cmd += ["--max-price", str(max_price)]
+        # In the script, --zip takes one or more values; we just append them.
+        cmd += ["--zip", *shard]
+        return cmd
+
+    with tempfile.TemporaryDirectory(prefix="haven-ingest-") as tmp:
+        outs = [Path(tmp) / f"shard_{i}.jsonl" for i in range(n_shards)]
+        cmds = [_shard_cmd(shard, out) for shard, out in zip(shards, outs, strict=True)]
+        for cmd in cmds:
+            logger.info("Running ingest command", cmd=" ".join(cmd))
+
+        with ThreadPoolExecutor(max_workers=n_shards) as ex:
+            returncodes = list(ex.map(_run_streaming, cmds, shards))
+
+        # Failed shards still wrote the ZIPs they finished before failing.
+        repo = SqlPropertyRepository(config.DB_URI)
+        for shard, out in zip(shards, outs, strict=True):
+            if not out.exists():
+                continue
+            with out.open("rb") as f:
+                n = repo.upsert_many(orjson.loads(line) for line in f)
+            logger.info("[ingest {}] upserted {} properties", ",".join(shard), n)
+
+    failed = [(cmd, rc) for cmd, rc in zip(cmds, returncodes, strict=True) if rc != 0]
+    if failed:
+        cmd, rc = failed[0]
+        logger.error(
+            "Data refresh failed",
+            failed_shards=[c[c.index("--zip") + 1:] for c, _ in failed],
+        )
+        raise subprocess.CalledProcessError(rc, cmd)
 
-    # Build CLI command: python scripts/ingest_properties_parallel.py --zip ... --workers ...
-    cmd = [
-        sys.executable,
-        "scripts/ingest_properties_parallel.py",
-        "--workers",
-        str(workers),
-    ]
-
-    if max_price is not None:
-        cmd += ["--max-price", str(max_price)]
-
-    # In the script, --zip takes one or more values; we just append them.
-    cmd += ["--zip", *zipcodes]
-
-    logger.info("Running ingest command", cmd=" ".join(cmd))
-    subprocess.run(cmd, check=True)
-
-    logger.info("Data refresh completed", zipcodes=list(zipcodes))
+    logger.info("Data refresh completed", zipcodes=zipcodes)
 
 
 # ---------------------------
@@ -219,6 +290,37 @@ def train_all_models(force_arv_fetch: bool = False) -> None:
 # 3. EVALUATION / TRUST
 # ---------------------------
 
+# Process-local cache of unpickled model bundles: resolved path -> (mtime_ns, bundle).
+# A retrain rewrites the file, bumps its mtime and so invalidates the entry.
+_MODEL_CACHE: Dict[Path, tuple[int, Any]] = {}
+
+
+def _load_model(path: Path) -> Any:
+    import joblib
+
+    key = path.resolve()
+    mtime = key.stat().st_mtime_ns
+    cached = _MODEL_CACHE.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, joblib.load(key))
+        _MODEL_CACHE[key] = cached
+    return cached[1]
+
+
+def _write_report_csv(df: Any, path: Path) -> None:
+    """
+    Write an eval report with pyarrow's vectorized CSV writer.
+
+    The "zip" column mixes real ZIPs with the "ALL" summary row, so cast it
+    to str first (arrow can't infer a type for mixed int/str object columns).
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    df = df.assign(zip=df["zip"].astype(str))
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+
+
 def eval_arv_models() -> Path:
     """
     Evaluate ARV quantile model and write per-ZIP MAE/MAPE.
@@ -230,7 +332,6 @@ def eval_arv_models() -> Path:
     Writes:
       - data/reports/arv_eval_by_zip.csv
     """
-    import joblib
     import numpy as np
     import pandas as pd
 
@@ -259,9 +360,9 @@ def eval_arv_models() -> Path:
         )
 
     df = pd.read_parquet(training_path)
-    df = df.copy().dropna(subset=["target_arv", "zipcode"])
+    df = df.dropna(subset=["target_arv", "zipcode"])
 
-    bundle: Dict[str, Any] = joblib.load(model_path)
+    bundle: Dict[str, Any] = _load_model(model_path)
 
     models = bundle.get("models") or bundle.get("models_by_quantile")
     if models is None:
@@ -282,23 +383,27 @@ def eval_arv_models() -> Path:
         raise KeyError("ARV bundle missing 'feature_names' key")
 
     # Let LightGBM handle NaNs; only require target/zipcode to be present
-    df_features = df[feature_names].copy()
+    df_features = df[feature_names]
 
     if df_features.empty:
         raise RuntimeError("No feature rows available for ARV eval.")
 
-    X = df_features.to_numpy(dtype=float)
+    # float32 is a native LightGBM input dtype: half the feature-matrix
+    # bandwidth of float64, with no conversion inside predict().
+    X = df_features.to_numpy(dtype=np.float32)
     y_true = df["target_arv"].to_numpy(dtype=float)
 
 
     y_pred = median_model.predict(X)
 
     abs_err = (y_pred - y_true).__abs__()
-    pct_err = abs_err / np.clip(y_true, 1.0, None)
+    # Floor the denominator at 1.0, then divide in place into that buffer.
+    pct_err = np.maximum(y_true, 1.0)
+    np.divide(abs_err, pct_err, out=pct_err)
 
-    df_eval = df[["zipcode"]].copy()
-    df_eval["abs_err"] = abs_err
-    df_eval["pct_err"] = pct_err
+    df_eval = pd.DataFrame(
+        {"zipcode": df["zipcode"].to_numpy(), "abs_err": abs_err, "pct_err": pct_err}
+    )
 
     grouped = (
         df_eval.groupby("zipcode")
@@ -320,7 +425,7 @@ def eval_arv_models() -> Path:
 
     grouped = pd.concat([grouped, pd.DataFrame([overall])], ignore_index=True)
 
-    grouped.to_csv(report_path, index=False)
+    _write_report_csv(grouped, report_path)
     logger.info("ARV evaluation report written", report_path=str(report_path))
     return report_path
 
@@ -336,7 +441,6 @@ def eval_rent_models() -> Path:
     Writes:
       - data/reports/rent_eval_by_zip.csv
     """
-    import joblib
     import numpy as np
     import pandas as pd
 
@@ -365,9 +469,9 @@ def eval_rent_models() -> Path:
         )
 
     df = pd.read_parquet(training_path)
-    df = df.copy().dropna(subset=["target_rent", "zipcode"])
+    df = df.dropna(subset=["target_rent", "zipcode"])
 
-    bundle: Dict[str, Any] = joblib.load(model_path)
+    bundle: Dict[str, Any] = _load_model(model_path)
 
     # Models dict can be keyed by strings ("p50", "0.5") or floats (0.5)
     models = bundle.get("models") or bundle.get("models_by_quantile")
@@ -395,8 +499,6 @@ def eval_rent_models() -> Path:
     if not feature_names:
         raise KeyError("Rent bundle missing 'feature_names' key")
 
-    df = pd.read_parquet(training_path)
-
     # 🔧 NEW: ensure all required feature columns exist
     missing = [c for c in feature_names if c not in df.columns]
     if missing:
@@ -405,26 +507,29 @@ def eval_rent_models() -> Path:
             extra={"context": {"missing": missing}},
         )
         # For now, just fill with 0.0 so evaluation can run
-        for c in missing:
-            df[c] = 0.0
+        df = df.assign(**{c: 0.0 for c in missing})
 
-    df_features = df[feature_names].copy()
+    df_features = df[feature_names]
 
     if df_features.empty:
         raise RuntimeError("No feature rows available for rent eval.")
 
 
-    X = df_features.to_numpy(dtype=float)
+    # float32 is a native LightGBM input dtype: half the feature-matrix
+    # bandwidth of float64, with no conversion inside predict().
+    X = df_features.to_numpy(dtype=np.float32)
     y_true = df["target_rent"].to_numpy(dtype=float)
 
     y_pred = median_model.predict(X)
 
     abs_err = (y_pred - y_true).__abs__()
-    pct_err = abs_err / np.clip(y_true, 1.0, None)
+    # Floor the denominator at 1.0, then divide in place into that buffer.
+    pct_err = np.maximum(y_true, 1.0)
+    np.divide(abs_err, pct_err, out=pct_err)
 
-    df_eval = df[["zipcode"]].copy()
-    df_eval["abs_err"] = abs_err
-    df_eval["pct_err"] = pct_err
+    df_eval = pd.DataFrame(
+        {"zipcode": df["zipcode"].to_numpy(), "abs_err": abs_err, "pct_err": pct_err}
+    )
 
     grouped = (
         df_eval.groupby("zipcode")
@@ -445,7 +550,7 @@ def eval_rent_models() -> Path:
     }
     grouped = pd.concat([grouped, pd.DataFrame([overall])], ignore_index=True)
 
-    grouped.to_csv(report_path, index=False)
+    _write_report_csv(grouped, report_path)
     logger.info("Rent evaluation report written", report_path=str(report_path))
     return report_path
 
@@ -461,9 +566,9 @@ def eval_flip_classifier() -> Path:
     Writes:
       - data/reports/flip_eval.json
     """
-    import joblib
     import numpy as np
     import pandas as pd
+    import pyarrow.parquet as pq
     from sklearn.metrics import (
         accuracy_score,
         average_precision_score,
@@ -498,69 +603,72 @@ def eval_flip_classifier() -> Path:
             "Run train_flip_classifier() first."
         )
 
-    df = pd.read_parquet(training_path).copy()
-
-    if "is_good_flip" not in df.columns:
-        raise KeyError("flip_training.parquet must contain 'is_good_flip' label column.")
-
-    y_true = df["is_good_flip"].astype(int).to_numpy()
-
-    drop_cols = {
-        "is_good_flip",
-        "actual_roi",
-        "deal_id",
-        "address",
-        "city",
-        "state",
-        "zipcode",
-        "notes",
-    }
-    feature_cols = [
-        c
-        for c in df.columns
-        if c not in drop_cols and np.issubdtype(df[c].dtype, np.number)
-    ]
-    if not feature_cols:
-        raise RuntimeError("No numeric feature columns found for flip classifier eval.")
-
-    X = df[feature_cols].to_numpy(dtype=float)
-
-        # Load classifier; newer training code saves a bundle dict
-    bundle = joblib.load(model_path)
+    # Load classifier first; newer training code saves a bundle dict whose
+    # feature_names let us read only the needed columns from the parquet.
+    bundle = _load_model(model_path)
 
     if isinstance(bundle, dict):
         model = bundle.get("model")
         if model is None:
             raise KeyError("Flip classifier bundle missing 'model' key")
-        # Optionally sanity check feature names, but don't hard-fail:
-        bundle_features = bundle.get("feature_names")
-        if bundle_features:
-            # You *could* assert equality or log mismatch here; for now just log.
-            if list(bundle_features) != feature_cols:
-                logger.warning(
-                    "flip_eval_feature_mismatch",
-                    extra={
-                        "context": {
-                            "bundle_feature_names": list(bundle_features),
-                            "eval_feature_cols": feature_cols,
-                        }
-                    },
-                )
+        bundle_features = list(bundle.get("feature_names") or [])
     else:
         # Backward-compat: older models may be saved as bare LGBMClassifier
         model = bundle
+        bundle_features = []
+
+    available_cols = set(pq.read_schema(training_path).names)
+    if "is_good_flip" not in available_cols:
+        raise KeyError("flip_training.parquet must contain 'is_good_flip' label column.")
+
+    if bundle_features and available_cols.issuperset(bundle_features):
+        feature_cols = bundle_features
+        df = pd.read_parquet(training_path, columns=[*feature_cols, "is_good_flip"])
+    else:
+        # No usable feature list in the bundle: infer numeric features from the frame.
+        df = pd.read_parquet(training_path)
+        drop_cols = {
+            "is_good_flip",
+            "actual_roi",
+            "deal_id",
+            "address",
+            "city",
+            "state",
+            "zipcode",
+            "notes",
+        }
+        feature_cols = [
+            c
+            for c in df.columns
+            if c not in drop_cols and np.issubdtype(df[c].dtype, np.number)
+        ]
+        if not feature_cols:
+            raise RuntimeError("No numeric feature columns found for flip classifier eval.")
+        if bundle_features:
+            logger.warning(
+                "flip_eval_feature_mismatch",
+                extra={
+                    "context": {
+                        "bundle_feature_names": bundle_features,
+                        "eval_feature_cols": feature_cols,
+                    }
+                },
+            )
 
-    proba = model.predict_proba(X)[:, 1]
+    y_true = df["is_good_flip"].astype(int).to_numpy()
+    X = df[feature_cols].to_numpy(dtype=np.float32)
+
+    # LightGBM binary boosters return P(y=1) as a 1-D array directly, so we
+    # skip predict_proba's Nx2 matrix (whose [:, 0] column we'd discard).
+    # num_threads=0 lets LightGBM use all OpenMP threads for this call.
+    booster = getattr(model, "booster_", None)
+    if booster is not None:
+        proba = np.asarray(booster.predict(X, num_threads=0), dtype=float)
+    else:
+        proba = model.predict_proba(X)[:, 1]
     y_pred = (proba >= 0.5).astype(int)
 
     metrics: Dict[str, Any] = {}
-    metrics["roc_auc"] = float(roc_auc_score(y_true, proba))
-    metrics["precision"] = float(precision_score(y_true, y_pred))
-    metrics["recall"] = float(recall_score(y_true, y_pred))
-    metrics["f1"] = float(f1_score(y_true, y_pred))
-    metrics["brier"] = float(brier_score_loss(y_true, proba))
-    # ... rest of your code unchanged ...
-
     metrics["n_samples"] = int(len(y_true))
 
     try:
@@ -575,21 +683,23 @@ def eval_flip_classifier() -> Path:
     metrics["recall"] = float(recall_score(y_true, y_pred, zero_division=0))
     metrics["f1"] = float(f1_score(y_true, y_pred, zero_division=0))
 
-    df_eval = df.copy()
-    df_eval["y_true"] = y_true
-    df_eval["p_good"] = proba
-    df_eval = df_eval.sort_values("p_good", ascending=False).reset_index(drop=True)
+    # Top-k by p_good without sorting all N rows: argpartition pulls the best
+    # k_max in O(N), then only those k_max get ordered.
+    ks = (10, 20, 50)
+    n = len(proba)
+    k_max = min(max(ks), n)
+    top = np.argpartition(-proba, k_max - 1)[:k_max] if k_max else np.empty(0, dtype=int)
+    top = top[np.argsort(-proba[top], kind="stable")]
 
     precision_at_k: Dict[str, float] = {}
-    for k in (10, 20, 50):
-        if len(df_eval) >= k:
-            top_k = df_eval.iloc[:k]
-            precision_at_k[str(k)] = float(top_k["y_true"].mean())
+    for k in ks:
+        if n >= k:
+            precision_at_k[str(k)] = float(y_true[top[:k]].mean())
         else:
-            precision_at_k[str(k)] = float(df_eval["y_true"].mean())
+            precision_at_k[str(k)] = float(y_true.mean())
     metrics["precision_at_k"] = precision_at_k
 
-    report_path.write_text(json.dumps(metrics, indent=2))
+    report_path.write_bytes(orjson.dumps(metrics, option=_JSON_OPTS))
     logger.info("Flip classifier evaluation report written", report_path=str(report_path))
     return report_path
 
@@ -650,11 +760,11 @@ def collect_metrics_snapshot() -> Path:
         snapshot["rent"] = {}
 
     if flip_path.exists():
-        snapshot["flip"] = json.loads(flip_path.read_text())
+        snapshot["flip"] = orjson.loads(flip_path.read_bytes())
     else:
         snapshot["flip"] = {}
 
-    snapshot_path.write_text(json.dumps(snapshot, indent=2))
+    snapshot_path.write_bytes(orjson.dumps(snapshot, option=_JSON_OPTS))
     logger.info("Metrics snapshot written", snapshot_path=str(snapshot_path))
     return snapshot_path
 
@@ -1,12 +1,143 @@
 from __future__ import annotations
 
-from typing import Any, Optional
 import sqlite3
+from typing import Any, Iterable, Optional
+
+# Columns written by an upsert, in bind order. `source`/`external_id` only
+# matter on insert; updates leave the identity columns untouched.
+_UPSERT_FIELDS = (
+    "address",
+    "city",
+    "state",
+    "zipcode",
+    "source",
+    "external_id",
+    "lat",
+    "lon",
+    "list_price",
+    "dscr",
+    "cash_on_cash_return",
+    "rank_score",
+    "label",
+    "reason",
+    "lead_score",
+)
+
+_INSERT_SQL = """
+INSERT INTO leads (
+  address, city, state, zipcode,
+  lat, lon,
+  source, external_id,
+  stage,
+  created_at, updated_at,
+  touches,
+  owner,
+  list_price,
+  dscr, cash_on_cash_return, rank_score, label, reason,
+  lead_score
+) VALUES (
+  :address, :city, :state, :zipcode,
+  :lat, :lon,
+  :source, :external_id,
+  'new',
+  datetime('now'), datetime('now'),
+  0,
+  NULL,
+  :list_price,
+  :dscr, :cash_on_cash_return, :rank_score, :label, :reason,
+  :lead_score
+)
+"""
+
+# Uniqueness: (source, external_id) if external_id present, else (address, zipcode).
+# This matches the existing behavior where rentcast and zillow rows can both exist;
+# an address match may hit any lead at that address, with or without an external_id.
+_FIND_BY_EXTERNAL_ID_SQL = "SELECT lead_id FROM leads WHERE source = ? AND external_id = ?"
+_FIND_BY_ADDRESS_SQL = "SELECT lead_id FROM leads WHERE address = ? AND zipcode = ?"
+
+_UPDATE_SQL = """
+UPDATE leads SET
+  address=:address,
+  city=:city,
+  state=:state,
+  zipcode=:zipcode,
+  lat=:lat,
+  lon=:lon,
+  list_price=:list_price,
+  dscr=:dscr,
+  cash_on_cash_return=:cash_on_cash_return,
+  rank_score=:rank_score,
+  label=:label,
+  reason=:reason,
+  lead_score=:lead_score,
+  updated_at=datetime('now')
+WHERE lead_id=:lead_id
+"""
 
 
 class LeadsRepo:
+    """
+    Lead upserts over a raw sqlite3 connection.
+
+    The connection is switched to WAL + synchronous=NORMAL on init: commits
+    no longer fsync the main DB file and readers don't block the writer.
+    WAL still allows only one writer at a time, so callers writing from
+    several threads/processes should funnel writes through one connection.
+    """
+
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
+        self._configure_connection()
+
+    def _configure_connection(self) -> None:
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+
+    @staticmethod
+    def _bind_row(row: dict[str, Any]) -> dict[str, Any]:
+        params = {f: row.get(f) for f in _UPSERT_FIELDS}
+        # Empty external_id behaves like a missing one (falls back to address+zipcode).
+        params["external_id"] = params["external_id"] or None
+        params["lead_score"] = float(params["lead_score"] or 0.0)
+        return params
+
+    def upsert_leads_bulk(self, rows: Iterable[dict[str, Any]]) -> dict[str, int]:
+        """
+        Upsert many leads in one transaction (single commit / fsync).
+
+        Each row is a dict with the same keys as upsert_lead's keyword arguments;
+        rows are matched exactly like upsert_lead, in order, so a later row can
+        update a lead inserted earlier in the same batch.
+
+        If the connection already has a transaction open, the batch runs inside
+        a savepoint and committing is left to the caller.
+
+        Returns: {"created": n, "updated": m}
+        """
+        params = [self._bind_row(r) for r in rows]
+        if not params:
+            return {"created": 0, "updated": 0}
+
+        owns_transaction = not self.conn.in_transaction
+        cur = self.conn.cursor()
+        cur.execute("BEGIN IMMEDIATE" if owns_transaction else "SAVEPOINT upsert_leads_bulk")
+        try:
+            created = sum(self._upsert_row(cur, p)[1] == "created" for p in params)
+        except Exception:
+            if owns_transaction:
+                self.conn.rollback()
+            else:
+                cur.execute("ROLLBACK TO upsert_leads_bulk")
+                cur.execute("RELEASE upsert_leads_bulk")
+            raise
+        if owns_transaction:
+            self.conn.commit()
+        else:
+            cur.execute("RELEASE upsert_leads_bulk")
+
+        return {"created": created, "updated": len(params) - created}
 
     def upsert_lead(
         self,
@@ -32,112 +163,42 @@ class LeadsRepo:
         """
         Returns: (lead_id, action) where action is "created" or "updated"
         """
-        cur = self.conn.cursor()
-
-        # Define uniqueness: (source, external_id) if external_id present, else (address, zipcode)
-        # This matches your current behavior where rentcast and zillow can both exist.
-        if external_id:
-            cur.execute(
-                """
-                SELECT lead_id FROM leads
-                WHERE source = ? AND external_id = ?
-                """,
-                (source, external_id),
-            )
-        else:
-            cur.execute(
-                """
-                SELECT lead_id FROM leads
-                WHERE address = ? AND zipcode = ?
-                """,
-                (address, zipcode),
+        params = self._bind_row(
+            dict(
+                address=address,
+                city=city,
+                state=state,
+                zipcode=zipcode,
+                source=source,
+                external_id=external_id,
+                lat=lat,
+                lon=lon,
+                list_price=list_price,
+                dscr=dscr,
+                cash_on_cash_return=cash_on_cash_return,
+                rank_score=rank_score,
+                label=label,
+                reason=reason,
+                lead_score=lead_score,
             )
+        )
+        result = self._upsert_row(self.conn.cursor(), params)
+        self.conn.commit()
+        return result
 
+    @staticmethod
+    def _upsert_row(cur: sqlite3.Cursor, params: dict[str, Any]) -> tuple[int, str]:
+        """Update the lead matching params' identity rule, else insert it (no commit)."""
+        if params["external_id"] is not None:
+            cur.execute(_FIND_BY_EXTERNAL_ID_SQL, (params["source"], params["external_id"]))
+        else:
+            cur.execute(_FIND_BY_ADDRESS_SQL, (params["address"], params["zipcode"]))
         row = cur.fetchone()
+
         if row:
             lead_id = int(row[0])
-            cur.execute(
-                """
-                UPDATE leads SET
-                  address=?,
-                  city=?,
-                  state=?,
-                  zipcode=?,
-                  lat=?,
-                  lon=?,
-                  list_price=?,
-                  dscr=?,
-                  cash_on_cash_return=?,
-                  rank_score=?,
-                  label=?,
-                  reason=?,
-                  lead_score=?,
-                  updated_at=datetime('now')
-                WHERE lead_id=?
-                """,
-                (
-                    address,
-                    city,
-                    state,
-                    zipcode,
-                    lat,
-                    lon,
-                    list_price,
-                    dscr,
-                    cash_on_cash_return,
-                    rank_score,
-                    label,
-                    reason,
-                    lead_score,
-                    lead_id,
-                ),
-            )
-            self.conn.commit()
+            cur.execute(_UPDATE_SQL, {**params, "lead_id": lead_id})
             return lead_id, "updated"
 
-        cur.execute(
-            """
-            INSERT INTO leads (
-              address, city, state, zipcode,
-              lat, lon,
-              source, external_id,
-              stage,
-              created_at, updated_at,
-              touches,
-              owner,
-              list_price,
-              dscr, cash_on_cash_return, rank_score, label, reason,
-              lead_score
-            ) VALUES (
-              ?,?,?,?,
-              ?,?,
-              ?,?,
-              'new',
-              datetime('now'), datetime('now'),
-              0,
-              NULL,
-              ?,
-              ?,?,?,?,?,
-              ?
-            )
-            """,
-            (
-                address,
-                city,
-                state,
-                zipcode,
-                lat,
-                lon,
-                source,
-                external_id,
-                list_price,
-                dscr,
-                cash_on_cash_return,
-                rank_score,
-                label,
-                reason,
-                lead_score,
-            ),
-        )
-        self.conn.commit()
-        return int(cur.lastrowid), "created"
+        cur.execute(_INSERT_SQL, params)
+        return int(cur.lastrowid or 0), "created"
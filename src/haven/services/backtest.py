@@ -2,54 +2,241 @@
 
 from __future__ import annotations
 
+import heapq
+import math
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from loguru import logger
 
-from haven.services.deal_analyzer import analyze_deal_with_defaults
+from haven.services.deal_analyzer import (
+    analyze_deal_cached,
+    analyze_deal_cheap,
+    preload_models,
+    set_model_threads,
+)
 
+# Payload fields that are passed through as-is, with their default when the
+# column is absent from the backtest CSV.
+_PASSTHROUGH_FIELDS = {
+    "address": "",
+    "city": "",
+    "state": "",
+    "property_type": "single_family",
+}
+_OPTIONAL_FLOAT_FIELDS = ("sqft", "bedrooms", "bathrooms")
 
-def _row_to_payload(row: pd.Series) -> Dict[str, Any]:
+# Rows per process-pool task; large enough to amortize pickling overhead.
+_CHUNK_SIZE = 500
+
+# K values reported under top_k_by_rank_score.
+_TOP_KS = (5, 10, 20, 50)
+_TOP_K_MAX = max(_TOP_KS)
+
+
+def _nullable_floats(col: pd.Series) -> np.ndarray:
+    """float column -> object array of Python floats, with None for NaN."""
+    out = col.astype(float).to_numpy().astype(object)
+    out[col.isna().to_numpy()] = None
+    return out
+
+
+def _prepare_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
     """
-    Convert a backtest CSV row into an analyze_deal payload.
+    Cast the backtest CSV columns into analyze_deal payload columns in one
+    vectorized pass.
 
+    Returns payload field -> array aligned with df's rows, so building a
+    payload is just picking the i-th element of each array.
     Adjust this mapping as needed to match your engine's expectations.
     """
-    payload: Dict[str, Any] = {
-        "address": row.get("address", ""),
-        "city": row.get("city", ""),
-        "state": row.get("state", ""),
-        "zipcode": str(row.get("zipcode", "")).strip(),
-        "list_price": float(row.get("list_price", 0.0)),
-        "sqft": float(row.get("sqft", 0.0)) if not pd.isna(row.get("sqft")) else None,
-        "bedrooms": float(row.get("bedrooms", 0.0)) if not pd.isna(row.get("bedrooms")) else None,
-        "bathrooms": float(row.get("bathrooms", 0.0)) if not pd.isna(row.get("bathrooms")) else None,
-        "property_type": row.get("property_type", "single_family"),
-    }
+    n = len(df)
+    cols: Dict[str, np.ndarray] = {}
+
+    for field, default in _PASSTHROUGH_FIELDS.items():
+        if field in df.columns:
+            cols[field] = df[field].to_numpy(dtype=object)
+        else:
+            cols[field] = np.full(n, default, dtype=object)
+
+    if "zipcode" in df.columns:
+        cols["zipcode"] = df["zipcode"].astype(str).str.strip().to_numpy(dtype=object)
+    else:
+        cols["zipcode"] = np.full(n, "", dtype=object)
+
+    if "list_price" in df.columns:
+        cols["list_price"] = df["list_price"].to_numpy(dtype=float).astype(object)
+    else:
+        cols["list_price"] = np.full(n, 0.0, dtype=object)
+
+    for field in _OPTIONAL_FLOAT_FIELDS:
+        if field in df.columns:
+            cols[field] = _nullable_floats(df[field])
+        else:
+            cols[field] = np.full(n, None, dtype=object)
 
     # Optional stuff
-    if "year_built" in row:
-        payload["year_built"] = (
-            int(row["year_built"]) if not pd.isna(row["year_built"]) else None
-        )
-    if "lat" in row and "lon" in row:
-        payload["lat"] = float(row["lat"]) if not pd.isna(row["lat"]) else None
-        payload["lon"] = float(row["lon"]) if not pd.isna(row["lon"]) else None
+    if "year_built" in df.columns:
+        year_built = df["year_built"]
+        years = year_built.fillna(0).astype(float).astype(int).to_numpy().astype(object)
+        years[year_built.isna().to_numpy()] = None
+        cols["year_built"] = years
+    if {"lat", "lon"}.issubset(df.columns):
+        cols["lat"] = _nullable_floats(df["lat"])
+        cols["lon"] = _nullable_floats(df["lon"])
+
+    return cols
+
+
+def _payload_rows(
+    index: pd.Index, cols: Dict[str, np.ndarray]
+) -> List[Tuple[Any, Dict[str, Any]]]:
+    """Zip the prepared payload columns back into (index, payload) rows."""
+    # Plain lists iterate faster than object arrays; binding dict/zip as
+    # locals makes the per-row lookups LOAD_FAST instead of builtins.
+    make_payload = dict
+    fields_zip = partial(zip, tuple(cols))
+    columns = [c.tolist() for c in cols.values()]
+    payloads = map(make_payload, map(fields_zip, zip(*columns, strict=True)))
+    return list(zip(index.tolist(), payloads, strict=True))
+
+
+def _init_worker() -> None:
+    # One LightGBM thread per predict call in each worker; the pool itself
+    # provides the parallelism, so more threads would oversubscribe cores.
+    # (OMP_NUM_THREADS is read when OpenMP loads, which is before the fork.)
+    set_model_threads(1)
+
+
+def _analyze_row(idx: Any, payload: Dict[str, Any]) -> Tuple[str, str, float, float]:
+    """
+    Run the engine on one payload ->
+    (label, label_tag, rank_score, cash_on_cash_return); see _label_tag.
+    """
+    try:
+        res = analyze_deal_cached(payload)
+    except Exception as exc:  # log and continue; bad rows shouldn't kill backtest
+        logger.exception("Error analyzing row in backtest", idx=idx, exc=exc)
+        return "error", "other", float("nan"), float("nan")
 
-    return payload
+    score = res.get("score", {})
 
+    # Label / suggestion. score_property emits its verdict as score["label"]
+    # (already one of buy/maybe/pass); legacy results carry "suggestion".
+    label = res.get("label")
+    if label is None:
+        label = score.get("suggestion") or score.get("label") or "unknown"
 
-def run_backtest(backtest_csv: Path, output_path: Path) -> None:
+    # Rank score
+    rank_score = score.get("rank_score", float("nan"))
+
+    # CoC as a proxy for predicted ROI
+    finance = res.get("finance", {})
+    coc = finance.get("cash_on_cash_return", float("nan"))
+
+    return label, _label_tag(label), rank_score, coc
+
+
+def _cheap_score(payload: Dict[str, Any]) -> float:
+    try:
+        return analyze_deal_cheap(payload)
+    except Exception:  # invalid rows sort last; the full pass would error on them too
+        return float("-inf")
+
+
+def _label_tag(label: Any) -> str:
+    """
+    Collapse an engine label to the bucket used for ROI-by-label stats:
+    "buy", "pass", "maybe" (any label mentioning maybe, e.g. "maybe (low DSCR)")
+    or "other".
+    """
+    if label == "buy" or label == "pass":
+        return label
+    if isinstance(label, str) and "maybe" in label.lower():
+        return "maybe"
+    return "other"
+
+
+def _analyze_chunk(
+    rows: List[Tuple[Any, Dict[str, Any]]],
+) -> List[Tuple[str, str, float, float]]:
+    return [_analyze_row(idx, payload) for idx, payload in rows]
+
+
+def _iter_results(
+    rows: List[Tuple[Any, Dict[str, Any]]], max_workers: int
+) -> Iterator[Tuple[str, str, float, float]]:
+    """Yield _analyze_row results for `rows`, in order."""
+    chunks = [
+        rows[i : i + _CHUNK_SIZE] for i in range(0, len(rows), _CHUNK_SIZE)
+    ]
+    if max_workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _analyze_chunk(chunk)
+        return
+
+    # Load models in the parent and fork, so workers inherit them
+    # copy-on-write. Where fork is unavailable (Windows), spawned workers
+    # load them once each on import.
+    preload_models()
+    start_method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(chunks)),
+        mp_context=mp.get_context(start_method),
+        initializer=_init_worker,
+    ) as pool:
+        # map() yields chunk results in submission order.
+        for results in pool.map(_analyze_chunk, chunks):
+            yield from results
+
+
+def _scatter_prefiltered(
+    analyzed: Iterator[Tuple[str, str, float, float]],
+    selected: np.ndarray,
+    n_rows: int,
+) -> Iterator[Tuple[str, str, float, float]]:
+    """Interleave results for the `selected` (sorted) rows with placeholders."""
+    skipped = ("prefiltered", "other", float("nan"), float("nan"))
+    selected_set = set(selected.tolist())
+    for i in range(n_rows):
+        yield next(analyzed) if i in selected_set else skipped
+
+
+def run_backtest(
+    backtest_csv: Path,
+    output_path: Path,
+    max_workers: Optional[int] = None,
+    prefilter_top: Optional[int] = None,
+) -> None:
     """
     Run the engine over historical deals and compare predictions to realized ROI.
 
     backtest_csv must contain at least:
-      - columns needed by analyze_deal_with_defaults
+      - columns needed by analyze_deal
       - 'actual_roi'  (float, e.g., 0.20 for 20%)
 
+    Rows go through analyze_deal_cached: repeated payloads are analyzed once
+    per worker, and backtest analyses are not saved to the deals DB.
+
+    Rows are analyzed in chunks of _CHUNK_SIZE across a process pool of
+    max_workers (default: cpu_count - 1); max_workers=1 runs serially.
+
+    prefilter_top=N ranks every row by ask price per sqft (analyze_deal_cheap)
+    and fully analyzes only the N cheapest; the rest are labelled
+    "prefiltered" (counted under error_or_other) with NaN scores. Use it when
+    only the top-K stats matter (K <= N); the per-label ROI means then cover
+    just the analyzed rows.
+
+    Per-row results are streamed to backtest_details.csv chunk by chunk;
+    the summary is built from running per-label sums and a top-K heap.
+
     Writes:
       - data/reports/backtest_summary.json
       - data/reports/backtest_details.csv
@@ -68,84 +255,96 @@ def run_backtest(backtest_csv: Path, output_path: Path) -> None:
             "Create data/raw/historical_deals.csv first."
         )
 
-    df = pd.read_csv(backtest_csv)
+    # pyarrow parser (multithreaded), numpy-backed columns: _prepare_columns
+    # converts everything to numpy/object arrays anyway.
+    df = pd.read_csv(backtest_csv, engine="pyarrow")
     if "actual_roi" not in df.columns:
         raise KeyError(
             "Backtest CSV must contain an 'actual_roi' column with realized ROI."
         )
 
-    df = df.copy()
     df["actual_roi"] = df["actual_roi"].astype(float)
 
-    engine_labels: List[str] = []
-    engine_rank_scores: List[float] = []
-    engine_coc: List[float] = []
-
-    for idx, row in df.iterrows():
-        payload = _row_to_payload(row)
-        try:
-            res = analyze_deal_with_defaults(payload)
-        except Exception as exc:  # log and continue; bad rows shouldn't kill backtest
-            logger.exception("Error analyzing row in backtest", idx=idx, exc=exc)
-            engine_labels.append("error")
-            engine_rank_scores.append(float("nan"))
-            engine_coc.append(float("nan"))
-            continue
-
-        # Label / suggestion
-        label = res.get("label")
-        if label is None:
-            label = res.get("score", {}).get("suggestion", "unknown")
+    rows = _payload_rows(df.index, _prepare_columns(df))
 
-        # Rank score
-        rank_score = res.get("score", {}).get("rank_score", float("nan"))
+    selected: Optional[np.ndarray] = None
+    if prefilter_top is not None and len(rows) > prefilter_top:
+        cheap_scores = np.array([_cheap_score(payload) for _, payload in rows])
+        selected = np.sort(np.argpartition(cheap_scores, -prefilter_top)[-prefilter_top:])
+        all_rows, rows = rows, [rows[i] for i in selected]
 
-        # CoC as a proxy for predicted ROI
-        finance = res.get("finance", {})
-        coc = finance.get("cash_on_cash_return", float("nan"))
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 1) - 1)
+    results = _iter_results(rows, max_workers)
+    if selected is not None:
+        results = _scatter_prefiltered(results, selected, len(all_rows))
 
-        engine_labels.append(label)
-        engine_rank_scores.append(rank_score)
-        engine_coc.append(coc)
+    # Stream results: each chunk of rows is written to the details CSV as
+    # soon as it is analyzed, and only running reductions are kept for the
+    # summary (per-label ROI sums/counts, a top-K heap by rank_score).
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    details_path = output_path.with_name("backtest_details.csv")
 
-    df["engine_label"] = engine_labels
-    df["engine_rank_score"] = engine_rank_scores
-    df["engine_cash_on_cash_return"] = engine_coc
+    actual_roi = df["actual_roi"].to_numpy()
+    # tag -> [n_rows, roi_sum, n_roi] (NaN ROIs are skipped, like Series.mean)
+    label_stats: Dict[str, List[float]] = {
+        tag: [0, 0.0, 0] for tag in ("buy", "maybe", "pass", "other")
+    }
+    top_heap: List[Tuple[float, int, float]] = []  # (rank_score, row, roi)
+
+    for start in range(0, max(len(df), 1), _CHUNK_SIZE):
+        batch = list(islice(results, _CHUNK_SIZE))
+        out = df.iloc[start : start + len(batch)].assign(
+            engine_label=[r[0] for r in batch],
+            engine_rank_score=[r[2] for r in batch],
+            engine_cash_on_cash_return=[r[3] for r in batch],
+        )
+        out.to_csv(details_path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+        for i, (_, tag, rank_score, _) in enumerate(batch, start):
+            roi = actual_roi[i]
+            stats = label_stats[tag]
+            stats[0] += 1
+            if not math.isnan(roi):
+                stats[1] += roi
+                stats[2] += 1
+            if rank_score is None or math.isnan(rank_score):
+                continue
+            item = (float(rank_score), -i, float(roi))
+            if len(top_heap) < _TOP_K_MAX:
+                heapq.heappush(top_heap, item)
+            else:
+                heapq.heappushpop(top_heap, item)
+
+    def safe_mean(stats: List[float]) -> float | None:
+        n_rows, roi_sum, n_roi = stats
+        if n_rows == 0:
+            return None
+        return float(roi_sum / n_roi) if n_roi else float("nan")
 
     # Basic ROI comparisons
     overall_mean_roi = float(df["actual_roi"].mean())
 
-    buy_mask = df["engine_label"] == "buy"
-    maybe_mask = df["engine_label"].str.contains("maybe", case=False, na=False)
-    pass_mask = df["engine_label"] == "pass"
-
-    def safe_mean(mask) -> float | None:
-        filtered = df.loc[mask, "actual_roi"]
-        return float(filtered.mean()) if len(filtered) > 0 else None
-
     mean_roi_by_label = {
-        "buy": safe_mean(buy_mask),
-        "maybe": safe_mean(maybe_mask),
-        "pass": safe_mean(pass_mask),
-        "error_or_other": safe_mean(
-            ~(buy_mask | maybe_mask | pass_mask)
-        ),
+        "buy": safe_mean(label_stats["buy"]),
+        "maybe": safe_mean(label_stats["maybe"]),
+        "pass": safe_mean(label_stats["pass"]),
+        "error_or_other": safe_mean(label_stats["other"]),
     }
 
     # Top-K by rank_score (best deals)
-    df_sorted = df.dropna(subset=["engine_rank_score"]).sort_values(
-        "engine_rank_score", ascending=False
-    )
+    top_rois = [roi for _, _, roi in sorted(top_heap, reverse=True)]
     top_k_stats: Dict[str, Any] = {}
-    for k in (5, 10, 20, 50):
-        if len(df_sorted) == 0:
+    for k in _TOP_KS:
+        if not top_rois:
             top_k_stats[str(k)] = {"n": 0, "mean_actual_roi": None}
             continue
-        k_eff = min(k, len(df_sorted))
-        subset = df_sorted.head(k_eff)
+        k_eff = min(k, len(top_rois))
+        subset = np.asarray(top_rois[:k_eff])
+        subset = subset[~np.isnan(subset)]
         top_k_stats[str(k)] = {
             "n": int(k_eff),
-            "mean_actual_roi": float(subset["actual_roi"].mean()),
+            "mean_actual_roi": float(subset.mean()) if subset.size else float("nan"),
         }
 
     summary = {
@@ -156,13 +355,8 @@ def run_backtest(backtest_csv: Path, output_path: Path) -> None:
     }
 
     # Write summary JSON
-    output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(summary, indent=2))
 
-    # Also write enriched per-deal CSV next to it
-    details_path = output_path.with_name("backtest_details.csv")
-    df.to_csv(details_path, index=False)
-
     logger.info(
         "Backtest completed",
         summary_path=str(output_path),
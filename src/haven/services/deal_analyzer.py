@@ -1,30 +1,98 @@
 from __future__ import annotations
 
-from typing import Any
-
+import heapq
+import json
+import logging
+import math
+import multiprocessing as mp
+import os
+import re
+import threading
+from collections.abc import Callable, Hashable, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, TypeVar
+
+import numpy as np
 import pandas as pd
 
-from haven.adapters.arv_quantile_bundle import predict_arv_quantiles
-from haven.adapters.config import config
+from haven.adapters.arv_quantile_bundle import predict_arv_quantiles_batch, preload_bundle
+from haven.adapters.arv_quantile_bundle import set_num_threads as set_arv_num_threads
+from haven.adapters.config import config, on_config_change
 from haven.adapters.flip_classifier import FlipClassifier
 from haven.adapters.logging_utils import get_logger
 from haven.adapters.rent_estimator_lightgbm import LightGBMRentEstimator
 from haven.adapters.sql_repo import SqlDealRepository
 from haven.analysis.finance import analyze_property_financials
-from haven.analysis.scoring import score_deal, score_property
+from haven.analysis.scoring import (
+    score_deal,
+    score_properties_batch,
+    score_property,
+    score_property_inputs,
+)
 from haven.analysis.valuation import summarize_deal_pricing
 from haven.domain.assumptions import UnderwritingAssumptions
 from haven.domain.ports import DealRepository, RentEstimator
-from haven.domain.property import Property, Unit
+from haven.domain.property import Property, UnitsTable
 from haven.services.guardrails import apply_guardrails
 from haven.services.validation import validate_and_prepare_payload
 
 logger = get_logger(__name__)
 
-_flip_clf = FlipClassifier()
 
-_default_repo: DealRepository = SqlDealRepository(uri="sqlite:///haven.db")
-_default_estimator: RentEstimator = LightGBMRentEstimator()
+# Default models / repo are built on first use, not at import: loading the
+# artifacts unpickles LightGBM + sklearn (seconds), which callers passing
+# their own estimator and repo should never pay for.
+@lru_cache(maxsize=1)
+def _get_flip_clf() -> FlipClassifier:
+    return FlipClassifier()
+
+
+def _flip_ready() -> bool:
+    # the flip model is loaded once, so its readiness is fixed too
+    return bool(getattr(_get_flip_clf(), "is_ready", False))
+
+
+def _assumptions_from_config() -> UnderwritingAssumptions:
+    return UnderwritingAssumptions(
+        vacancy_rate=config.VACANCY_RATE,
+        maintenance_rate=config.MAINTENANCE_RATE,
+        property_mgmt_rate=config.PROPERTY_MGMT_RATE,
+        capex_rate=config.CAPEX_RATE,
+        closing_cost_pct=config.DEFAULT_CLOSING_COST_PCT,
+        min_dscr_good=config.MIN_DSCR_GOOD,
+    )
+
+
+# Built once from config and shared by every analysis (treat as read-only);
+# rebuilt when one of its config fields is reassigned at runtime.
+_DEFAULT_ASSUMPTIONS: UnderwritingAssumptions = _assumptions_from_config()
+_ASSUMPTION_FIELDS = frozenset(
+    {"VACANCY_RATE", "MAINTENANCE_RATE", "PROPERTY_MGMT_RATE", "CAPEX_RATE", "DEFAULT_CLOSING_COST_PCT", "MIN_DSCR_GOOD"}
+)
+
+
+def invalidate_assumptions_cache() -> None:
+    """Rebuild _DEFAULT_ASSUMPTIONS from the current config."""
+    global _DEFAULT_ASSUMPTIONS
+    _DEFAULT_ASSUMPTIONS = _assumptions_from_config()
+
+
+on_config_change(lambda field: invalidate_assumptions_cache() if field in _ASSUMPTION_FIELDS else None)
+
+
+@lru_cache(maxsize=1)
+def _get_default_repo() -> DealRepository:
+    return SqlDealRepository(uri="sqlite:///haven.db")
+
+
+@lru_cache(maxsize=1)
+def _get_default_estimator() -> LightGBMRentEstimator:
+    return LightGBMRentEstimator()
+
 
 # ---------------------------------------------------------------------
 # Property type rules:
@@ -60,26 +128,94 @@ _ALLOWED_INTERNAL_TYPES = {
     "apartment_complex",
 }
 
+# Upstream descriptions -> internal type, matched in one regex scan per
+# pattern (same substring semantics as `"single" in t and "family" in t`).
+_EXCLUDED_TYPE_RE = re.compile(
+    "|".join(re.escape(bad) for bad in sorted(_EXCLUDED_UPSTREAM_TYPES, key=len, reverse=True))
+)
+_PROPERTY_TYPE_PATTERNS = (
+    (re.compile(r"single.*family|family.*single", re.DOTALL), "single_family"),
+    (re.compile(r"multi.*family|family.*multi|duplex|triplex|fourplex|4plex", re.DOTALL), "duplex_4plex"),
+    (re.compile(r"apartment|complex"), "apartment_complex"),
+)
+_PROPERTY_TYPE_ALIASES = MappingProxyType({"sfh": "single_family", "sfr": "single_family"})
+_EXCLUDED_TYPE = "__excluded__"
+
+# upstream keys that carry the property type when payload["property_type"] is empty
+_PROPERTY_TYPE_KEYS = ("propertyType", "homeType", "home_type", "type")
 
-def _is_missing_rent(value: float | None) -> bool:
-    if value is None:
-        return True
-    try:
-        v = float(value)
-    except (TypeError, ValueError):
-        return True
-    return v <= 50.0
+
+def preload_models() -> None:
+    """
+    Force every model artifact the default analyzer uses into memory.
+
+    The flip classifier, rent estimator and ARV quantile bundle otherwise
+    load lazily on first use. Call this before forking
+    workers so children share the loaded models copy-on-write instead of
+    each reading them from disk. The defaults hold no open file handles or
+    device contexts, so they are fork-safe.
+    """
+    _get_flip_clf()
+    _get_default_estimator()
+    preload_bundle()
+
+
+def set_model_threads(num_threads: int, rent_estimator: RentEstimator | None = None) -> None:
+    """
+    LightGBM threads per predict call for this process's models: the flip
+    classifier, the ARV bundle and `rent_estimator` (default: the default
+    estimator). Process-pool workers pass 1 so the pool, not OpenMP,
+    provides the parallelism; predictions do not depend on the count.
+    """
+    _get_flip_clf().set_num_threads(num_threads)
+    set_arv_num_threads(num_threads)
+    estimator = rent_estimator if rent_estimator is not None else _get_default_estimator()
+    set_estimator_threads = getattr(estimator, "set_num_threads", None)
+    if set_estimator_threads is not None:
+        set_estimator_threads(num_threads)
+
+
+def _rent_missing(value: float | None) -> bool:
+    """Rent fields are validated to float | None on Unit / Property; NaN or <= $50 counts as missing."""
+    return value is None or not value > 50.0
 
 
 def _coerce_float(val: Any, default: float = 0.0) -> float:
+    # Exact float / int / None (the common cases) skip the try/except setup
+    # and, for floats, the float() call; subclasses (bool, numpy scalars)
+    # take the generic path.
+    t = type(val)
+    if t is float:
+        return val
     if val is None:
         return default
+    if t is int:
+        return float(val)
     try:
         return float(val)
     except (TypeError, ValueError):
         return default
 
 
+@lru_cache(maxsize=1024)
+def _classify_property_type(t: str) -> str | None:
+    """
+    Internal type for a lower-cased upstream description, _EXCLUDED_TYPE for
+    the hard exclusions, or None when the text says nothing (caller falls
+    back to the unit count). Bulk payloads repeat a handful of spellings,
+    so results are memoized.
+    """
+    if _EXCLUDED_TYPE_RE.search(t):
+        return _EXCLUDED_TYPE
+    label = _PROPERTY_TYPE_ALIASES.get(t)
+    if label is not None:
+        return label
+    for pattern, label in _PROPERTY_TYPE_PATTERNS:
+        if pattern.search(t):
+            return label
+    return None
+
+
 def _normalize_property_type(payload: dict[str, Any]) -> str:
     """
     Normalize upstream 'property_type' variants to internal literal values.
@@ -96,13 +232,7 @@ def _normalize_property_type(payload: dict[str, Any]) -> str:
     # pull from payload first, otherwise try common upstream keys
     pt_raw = str(pt or "").strip()
     if not pt_raw:
-        pt_raw = str(
-            raw.get("propertyType")
-            or raw.get("homeType")
-            or raw.get("home_type")
-            or raw.get("type")
-            or ""
-        ).strip()
+        pt_raw = str(_first_present(raw, _PROPERTY_TYPE_KEYS, "")).strip()
 
     t = pt_raw.lower().strip()
 
@@ -112,28 +242,12 @@ def _normalize_property_type(payload: dict[str, Any]) -> str:
             raise ValueError("excluded property_type: condo/townhome not allowed")
         return t
 
-    # hard exclusions
-    for bad in _EXCLUDED_UPSTREAM_TYPES:
-        if bad in t and t != "single_family":
-            # example: "Condo", "Townhouse", "Manufactured", "Vacant Land"
-            raise ValueError(f"excluded property_type: {pt_raw}")
-
-    # now map remaining upstream descriptions
-    # Single Family
-    if "single" in t and "family" in t:
-        return "single_family"
-    if t in {"sfh", "sfr"}:
-        return "single_family"
-
-    # Multi-family (2-4 units)
-    if "multi" in t and "family" in t:
-        return "duplex_4plex"
-    if "duplex" in t or "triplex" in t or "fourplex" in t or "4plex" in t:
-        return "duplex_4plex"
-
-    # Apartment / 5+ units (commercial multi-family / complex)
-    if "apartment" in t or "complex" in t:
-        return "apartment_complex"
+    label = _classify_property_type(t)
+    if label == _EXCLUDED_TYPE:
+        # example: "Condo", "Townhouse", "Manufactured", "Vacant Land"
+        raise ValueError(f"excluded property_type: {pt_raw}")
+    if label is not None:
+        return label
 
     # If we can infer by units count (if present)
     units = payload.get("units")
@@ -150,11 +264,80 @@ def _normalize_property_type(payload: dict[str, Any]) -> str:
     return "single_family"
 
 
+# Upstream providers name the same listing fields differently; the first
+# non-empty alias wins, then the parsed Property attribute.
+_FEATURE_ALIASES: dict[str, tuple[str, ...]] = {
+    "bedrooms": ("bedrooms", "num_bedrooms"),
+    "bathrooms": ("bathrooms", "num_bathrooms"),
+    "sqft": ("sqft", "building_sqft", "living_area"),
+}
+
+
+def _first_present(d: dict[str, Any], keys: tuple[str, ...], default: Any = None) -> Any:
+    """
+    First truthy d[k] over `keys`, else `default`: the `d.get(a) or d.get(b) or
+    ... or default` chain, so empty strings and zeros fall through.
+    """
+    for k in keys:
+        v = d.get(k)
+        if v:
+            return v
+    return default
+
+
+def _single_door_rent_features(prop: Property, payload: dict[str, Any]) -> tuple[float, float, float]:
+    """(bedrooms, bathrooms, sqft) for a single-door rent estimate, resolving upstream aliases."""
+    out = []
+    for field, aliases in _FEATURE_ALIASES.items():
+        raw = _first_present(payload, aliases, getattr(prop, field, None))
+        out.append(_coerce_float(raw, 0.0))
+    return out[0], out[1], out[2]
+
+
+def build_feature_frame(payloads: list[dict[str, Any]], props: list[Property]) -> pd.DataFrame:
+    """
+    Vectorized _single_door_rent_features over many deals: one row per
+    payload with bedrooms / bathrooms / sqft (aliases coalesced column-wise,
+    0.0 when missing) plus zipcode / property_type, i.e. the frame
+    predict_unit_rents expects.
+    """
+
+    def present(values: list[Any]) -> pd.Series:
+        # `or` semantics of the scalar path: empty / zero / non-numeric count as missing
+        col = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").astype(float)
+        return col.where(col != 0)
+
+    frame: dict[str, Any] = {}
+    for field, aliases in _FEATURE_ALIASES.items():
+        col = present([p.get(aliases[0]) for p in payloads])
+        for alias in aliases[1:]:
+            col = col.combine_first(present([p.get(alias) for p in payloads]))
+        col = col.combine_first(present([getattr(prop, field, None) for prop in props]))
+        frame[field] = col.fillna(0.0).to_numpy(dtype=float)
+    frame["zipcode"] = [
+        str(p.get("zipcode") or getattr(prop, "zipcode", "") or "") for p, prop in zip(payloads, props, strict=True)
+    ]
+    frame["property_type"] = [
+        str(p.get("property_type") or getattr(prop, "property_type", "single_family") or "single_family")
+        for p, prop in zip(payloads, props, strict=True)
+    ]
+    return pd.DataFrame(frame)
+
+
 def _fill_missing_rents(prop: Property, rent_estimator: RentEstimator, payload: dict[str, Any]) -> Property:
     """
     Standardized rent fill:
     - always calls estimator with address/city/state/zipcode + beds/baths/sqft
+    - returns immediately when every rent is already present
     """
+    units = getattr(prop, "units", None)
+    if units:
+        missing = [u for u in units if _rent_missing(u.market_rent)]
+        if not missing:
+            return prop
+    elif not _rent_missing(getattr(prop, "est_market_rent", None)):
+        return prop
+
     addr = str(payload.get("address") or getattr(prop, "address", "") or "")
     city = str(payload.get("city") or getattr(prop, "city", "") or "")
     state = str(payload.get("state") or getattr(prop, "state", "") or "")
@@ -162,196 +345,611 @@ def _fill_missing_rents(prop: Property, rent_estimator: RentEstimator, payload:
     ptype = str(payload.get("property_type") or getattr(prop, "property_type", "single_family") or "single_family")
 
     # Multi-unit: fill per unit
-    if getattr(prop, "units", None):
-        for u in prop.units:
-            if _is_missing_rent(u.market_rent):
-                u.market_rent = rent_estimator.predict_unit_rent(
-                    address=addr,
-                    city=city,
-                    state=state,
-                    zipcode=zipcode,
-                    bedrooms=_coerce_float(u.bedrooms, 0.0),
-                    bathrooms=_coerce_float(u.bathrooms, 0.0),
-                    sqft=_coerce_float(u.sqft, 0.0),
-                    property_type=ptype,
+    if units:
+        predict_batch = getattr(rent_estimator, "predict_unit_rents", None)
+        if len(missing) > 1 and predict_batch is not None:
+            # One model call for all missing units instead of one per unit.
+            rents = predict_batch(
+                pd.DataFrame(
+                    {
+                        "bedrooms": [_coerce_float(u.bedrooms, 0.0) for u in missing],
+                        "bathrooms": [_coerce_float(u.bathrooms, 0.0) for u in missing],
+                        "sqft": [_coerce_float(u.sqft, 0.0) for u in missing],
+                        "zipcode": zipcode,
+                        "property_type": ptype,
+                    }
                 )
+            )
+            for u, rent in zip(missing, rents, strict=True):
+                u.market_rent = float(rent)
+            return prop
+
+        for u in missing:
+            u.market_rent = rent_estimator.predict_unit_rent(
+                address=addr,
+                city=city,
+                state=state,
+                zipcode=zipcode,
+                bedrooms=_coerce_float(u.bedrooms, 0.0),
+                bathrooms=_coerce_float(u.bathrooms, 0.0),
+                sqft=_coerce_float(u.sqft, 0.0),
+                property_type=ptype,
+            )
         return prop
 
     # Single-door: fill est_market_rent
-    if _is_missing_rent(getattr(prop, "est_market_rent", None)):
-        b_raw = payload.get("bedrooms") or payload.get("num_bedrooms") or getattr(prop, "bedrooms", None)
-        ba_raw = payload.get("bathrooms") or payload.get("num_bathrooms") or getattr(prop, "bathrooms", None)
-        sqft_raw = payload.get("sqft") or payload.get("building_sqft") or payload.get("living_area") or getattr(prop, "sqft", None)
-
-        est = rent_estimator.predict_unit_rent(
-            address=addr,
-            city=city,
-            state=state,
-            zipcode=zipcode,
-            bedrooms=_coerce_float(b_raw, 0.0),
-            bathrooms=_coerce_float(ba_raw, 0.0),
-            sqft=_coerce_float(sqft_raw, 0.0),
-            property_type=ptype,
-        )
-        prop.est_market_rent = est
-
+    bedrooms, bathrooms, sqft = _single_door_rent_features(prop, payload)
+    prop.est_market_rent = rent_estimator.predict_unit_rent(
+        address=addr,
+        city=city,
+        state=state,
+        zipcode=zipcode,
+        bedrooms=bedrooms,
+        bathrooms=bathrooms,
+        sqft=sqft,
+        property_type=ptype,
+    )
     return prop
 
 
-def _compute_flip_probability(finance: dict[str, Any], payload: dict[str, Any]) -> float | None:
-    if not getattr(_flip_clf, "is_ready", False):
-        return None
-    try:
-        features = {
-            "dscr": float(finance.get("dscr", 0.0)),
-            "cash_on_cash_return": float(finance.get("cash_on_cash_return", 0.0)),
-            "breakeven_occupancy_pct": float(finance.get("breakeven_occupancy_pct", 0.0)),
-            "price": float(payload.get("list_price") or 0.0),
-            "sqft": float(payload.get("sqft") or 0.0),
-            "days_on_market": float(payload.get("days_on_market") or 0.0),
-        }
-        return _flip_clf.predict_proba_one(features)
-    except Exception as e:
-        logger.warning("flip_probability_failed", extra={"error": str(e)})
-        return None
+_QUANTILE_KEYS = ("p10", "p50", "p90")
 
 
 def _sanitize_quantiles(q: dict[str, float] | None, fallback: float) -> dict[str, float]:
+    """Scalar _sanitize_quantiles_batch, for single deals (no pandas/NumPy setup)."""
+    base = float(fallback)
     if q is None:
-        base = float(fallback)
         return {"p10": base * 0.95, "p50": base, "p90": base * 1.05}
 
-    out: dict[str, float] = {}
-    for k in ("p10", "p50", "p90"):
-        v = q.get(k)
-        try:
-            vf = float(v)
-        except (TypeError, ValueError):
-            vf = float(fallback)
-        if not pd.notna(vf):
-            vf = float(fallback)
-        out[k] = vf
+    vals = [_coerce_float(q.get(k), math.nan) for k in _QUANTILE_KEYS]
+    p10, p50, p90 = (base if math.isnan(v) else v for v in vals)
+    p50 = max(p50, p10)
+    p90 = max(p90, p50)
+    return {"p10": p10, "p50": p50, "p90": p90}
 
-    p10 = out["p10"]
-    p50 = max(out["p50"], p10)
-    p90 = max(out["p90"], p50)
-    out["p10"], out["p50"], out["p90"] = p10, p50, p90
-    return out
 
+def _sanitize_quantiles_batch(
+    qs: list[dict[str, float] | None], fallbacks: list[float]
+) -> list[dict[str, float]]:
+    """
+    Per deal: p10/p50/p90 coerced to float (missing / non-numeric / NaN ->
+    that deal's fallback) and made non-decreasing; a missing quantile dict
+    becomes a +/-5% band around the fallback.
+    """
+    fb = np.asarray(fallbacks, dtype=float)
+    vals = (
+        pd.to_numeric(
+            pd.Series([None if q is None else q.get(k) for q in qs for k in _QUANTILE_KEYS], dtype=object),
+            errors="coerce",
+        )
+        .to_numpy(dtype=float)
+        .reshape(len(qs), len(_QUANTILE_KEYS))
+    )
+    vals = np.where(np.isnan(vals), fb[:, None], vals)
 
-def analyze_deal(
-    raw_payload: dict[str, Any],
-    rent_estimator: RentEstimator,
-    repo: DealRepository | None = None,
-    *,
-    save: bool = True,
-) -> dict[str, Any]:
+    vals = np.maximum.accumulate(vals, axis=1)
+
+    no_q = np.array([q is None for q in qs])
+    if no_q.any():
+        vals[no_q] = fb[no_q, None] * np.array([0.95, 1.0, 1.05])
+
+    return [dict(zip(_QUANTILE_KEYS, row, strict=True)) for row in vals.tolist()]
+
+
+_STRATEGY_MAP = MappingProxyType({"rental": "hold", "hold": "hold", "flip": "flip"})
+
+
+@dataclass(slots=True)
+class CleanedPayload:
+    """
+    One validated deal: the normalized payload dict (still handed to
+    guardrails), its Property, and the scalar fields the batch pipeline
+    reads per deal, resolved once so later stages read attributes instead
+    of re-walking payload.get() fallbacks.
     """
-    Main analysis entrypoint.
 
-    NEW:
-    - save=False => preview mode (does not write to deals DB)
-      This is required for fast /leads/from-properties bulk scoring.
-    - property_type normalization + hard exclusions (no condo/townhouse/manufactured/land)
+    payload: dict[str, Any]
+    prop: Property
+    list_price: float
+    sqft: float
+    days_on_market: float
+    strategy: str
+    zipcode: str
+    property_type: str
+
+
+def _prepare_deal(raw_payload: dict[str, Any]) -> CleanedPayload:
+    """
+    Validate + normalize one raw payload.
+    Raises ValueError for invalid payloads / excluded property types.
     """
     payload = validate_and_prepare_payload(raw_payload)
 
-    # normalize strategy
-    strategy_raw = str(payload.get("strategy", "hold")).lower()
-    if strategy_raw == "rental":
-        strategy = "hold"
-    elif strategy_raw in ("hold", "flip"):
-        strategy = strategy_raw
-    else:
-        strategy = "hold"
+    # normalize strategy (anything unrecognized -> hold)
+    strategy = _STRATEGY_MAP.get(str(payload.get("strategy", "hold")).lower(), "hold")
     payload["strategy"] = strategy
 
     # normalize + enforce property_type rules
     # (this will raise ValueError for excluded types)
     payload["property_type"] = _normalize_property_type(payload)
 
-    # units
-    units_data = payload.get("units")
-    if units_data:
-        payload["units"] = [Unit(**u) for u in units_data]
-
-    # parse into domain model (pydantic validation happens here too)
+    # parse into domain model (pydantic validation happens here too; `units`
+    # may be dicts or Unit instances, Property validates them into Units)
     prop = Property(**payload)
+    return CleanedPayload(
+        payload=payload,
+        prop=prop,
+        list_price=float(payload.get("list_price") or 0.0),
+        sqft=float(payload.get("sqft") or 0.0),
+        days_on_market=_coerce_float(payload.get("days_on_market") or 0.0, 0.0),
+        strategy=strategy,
+        zipcode=str(payload.get("zipcode") or prop.zipcode or ""),
+        property_type=str(payload.get("property_type") or prop.property_type or "single_family"),
+    )
 
-    # rent fill
-    prop = _fill_missing_rents(prop, rent_estimator, payload)
 
-    # derive gross rent
-    if getattr(prop, "units", None):
-        gross_rent = sum(float(u.market_rent or 0.0) for u in prop.units)
-    else:
-        gross_rent = float(getattr(prop, "est_market_rent", 0.0) or 0.0)
+def _units_table(deals: list[CleanedPayload]) -> UnitsTable:
+    """One UnitsTable over every multi-unit deal in `deals`, in deal order."""
+    return UnitsTable.from_unit_lists([deal.prop.units for deal in deals if deal.prop.units])
 
-    # underwriting assumptions
-    assumptions = UnderwritingAssumptions(
-        vacancy_rate=config.VACANCY_RATE,
-        maintenance_rate=config.MAINTENANCE_RATE,
-        property_mgmt_rate=config.PROPERTY_MGMT_RATE,
-        capex_rate=config.CAPEX_RATE,
-        closing_cost_pct=config.DEFAULT_CLOSING_COST_PCT,
-        min_dscr_good=config.MIN_DSCR_GOOD,
-    )
 
-    finance = analyze_property_financials(prop, assumptions)
-    finance["gross_monthly_rent"] = gross_rent
+def _fill_missing_rents_batch(
+    deals: list[CleanedPayload],
+    rent_estimator: RentEstimator,
+    units: UnitsTable,
+) -> None:
+    """
+    Rent fill for many deals with a single estimator call.
+
+    Every missing unit rent (masked on the columnar `units` table of the
+    multi-unit deals) and single-door rent across `deals` goes into one frame
+    for estimators exposing predict_unit_rents; otherwise (or when there is
+    at most one rent to fill) falls back to _fill_missing_rents. Filled
+    rents are written to both the table and the Unit objects.
+    """
+    predict_batch = getattr(rent_estimator, "predict_unit_rents", None)
+
+    rows = np.flatnonzero(units.missing_rent_mask())
+    single_doors = [deal for deal in deals if not deal.prop.units and _rent_missing(deal.prop.est_market_rent)]
+
+    if predict_batch is None or len(rows) + len(single_doors) <= 1:
+        for deal in deals:
+            _fill_missing_rents(deal.prop, rent_estimator, deal.payload)
+        units.reload_rents(rows)
+        return
+
+    frames: list[pd.DataFrame] = []
+    if len(rows):
+        multi = [deal for deal in deals if deal.prop.units]
+        owners = units.owners()[rows].tolist()
+        frames.append(
+            pd.DataFrame(
+                {
+                    "bedrooms": units.bedrooms[rows],
+                    "bathrooms": units.bathrooms[rows],
+                    "sqft": units.sqft[rows],
+                    "zipcode": [multi[i].zipcode for i in owners],
+                    "property_type": [multi[i].property_type for i in owners],
+                }
+            )
+        )
+    if single_doors:
+        frames.append(
+            build_feature_frame([deal.payload for deal in single_doors], [deal.prop for deal in single_doors])
+        )
+
+    rents = np.asarray(
+        predict_batch(pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]), dtype=float
+    )
+    units.set_rents(rows, rents[: len(rows)])
+    for deal, rent in zip(single_doors, rents[len(rows) :].tolist(), strict=True):
+        deal.prop.est_market_rent = rent
+
+    # one summary record per batch (no per-unit logging in this loop)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "rents_filled",
+            extra={"n_deals": len(deals), "n_units": len(rows), "n_single_door": len(single_doors)},
+        )
 
-    list_price = float(payload.get("list_price") or 0.0)
 
+def _gross_rents(deals: list[CleanedPayload], units: UnitsTable) -> list[float]:
+    """
+    Monthly gross rent per deal: the sum of unit rents for multi-unit deals
+    (per-property column sums over `units`), est_market_rent otherwise.
+    """
+    gross = [float(deal.prop.est_market_rent or 0.0) for deal in deals]
+    multi = [i for i, deal in enumerate(deals) if deal.prop.units]
+    for i, total in zip(multi, units.rent_totals().tolist(), strict=True):
+        gross[i] = total
+    return gross
+
+
+# Memoized model outputs for _predict_arv_batch / _compute_flip_probabilities.
+# Reanalysis, grid searches and multi-strategy runs keep hitting the same
+# list price / feature tuple, and a dict lookup is far cheaper than a
+# LightGBM predict. Keys are the exact model inputs, so a hit returns what
+# the model would. Plain dicts instead of lru_cache so misses can still be
+# predicted in one batch call; the oldest entries are evicted first.
+_PREDICTION_CACHE_SIZE = 8192
+_arv_cache: dict[float, tuple[float, float, float]] = {}
+_flip_cache: dict[tuple[float, ...], float] = {}
+# Serializes cache writes / eviction; reads take a snapshot with dict.get
+# (atomic), so a concurrent eviction can never drop a value mid-batch.
+_prediction_cache_lock = threading.Lock()
+_MISSING = object()
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+def clear_prediction_caches() -> None:
+    """Drop memoized ARV / flip predictions (e.g. after swapping models, or in tests)."""
+    with _prediction_cache_lock:
+        _arv_cache.clear()
+        _flip_cache.clear()
+
+
+def _memoized_batch(
+    cache: dict[_K, _V], keys: list[_K], predict: Callable[[list[_K]], Sequence[_V]]
+) -> list[_V]:
+    """cache lookups for `keys`; the distinct misses go through one predict(misses) call."""
+    found: dict[_K, _V] = {}
+    misses: list[_K] = []
+    for k in dict.fromkeys(keys):
+        v = cache.get(k, _MISSING)
+        if v is _MISSING:
+            misses.append(k)
+        else:
+            found[k] = v  # type: ignore[assignment]
+    if misses:
+        fresh = dict(zip(misses, predict(misses), strict=True))
+        found.update(fresh)
+        with _prediction_cache_lock:
+            cache.update(fresh)
+            for k in list(islice(cache, max(len(cache) - _PREDICTION_CACHE_SIZE, 0))):
+                del cache[k]
+    return [found[k] for k in keys]
+
+
+def _predict_arv_quantile_rows(list_prices: list[float]) -> list[tuple[float, float, float]]:
+    q = predict_arv_quantiles_batch({"base": np.array(list_prices, dtype=float)})
+    return [(float(r[0]), float(r[1]), float(r[2])) for r in q]
+
+
+def _predict_arv_batch(list_prices: np.ndarray) -> list[dict[str, float] | None]:
     try:
-        arv_q_raw = predict_arv_quantiles({"base": list_price})
+        q = _memoized_batch(_arv_cache, np.asarray(list_prices, dtype=float).tolist(), _predict_arv_quantile_rows)
     except Exception as exc:
         logger.warning("arv_quantile_inference_failed", extra={"error": str(exc)})
-        arv_q_raw = None
+        return [None] * len(list_prices)
+    return [{"q10": r[0], "q50": r[1], "q90": r[2]} for r in q]
 
-    arv_q = _sanitize_quantiles(arv_q_raw, fallback=list_price)
 
-    pricing = summarize_deal_pricing(
-        prop=prop,
-        sqft=float(payload.get("sqft") or 0.0),
-        assumptions=assumptions,
-        arv_q=arv_q,
-    )
+def _compute_flip_probabilities(
+    finances: list[dict[str, Any]], deals: list[CleanedPayload]
+) -> Sequence[float | None]:
+    """Batched _compute_flip_probability: one classifier call for the deals not already memoized."""
+    n = len(deals)
+    if n == 0 or not _flip_ready():
+        return [None] * n
+    try:
+        # columns in flip_classifier.FLIP_FEATURE_ORDER
+        values = np.array(
+            [
+                (
+                    finance.get("dscr") or 0.0,
+                    finance.get("cash_on_cash_return") or 0.0,
+                    finance.get("breakeven_occupancy_pct") or 0.0,
+                    deal.list_price,
+                    deal.sqft,
+                    deal.days_on_market,
+                )
+                for finance, deal in zip(finances, deals, strict=True)
+            ],
+            dtype=np.float64,
+        )
+        proba = _memoized_batch(_flip_cache, list(map(tuple, values.tolist())), _predict_flip_rows)
+    except Exception as e:
+        logger.warning("flip_probability_failed", extra={"error": str(e)})
+        return [None] * n
+    return proba
 
-    flip_p = _compute_flip_probability(finance, payload)
 
-    score_new = score_property(finance=finance, arv_q=arv_q, rent_q=None)
-    score_legacy = score_deal(finance)
+def _predict_flip_rows(rows: list[tuple[float, ...]]) -> list[float]:
+    if len(rows) == 1:
+        # single deal: LightGBM's single-row fast path, no batch setup
+        p = _get_flip_clf().predict_proba_row(np.array(rows[0], dtype=np.float32))
+        if p is None:
+            raise RuntimeError("flip classifier returned no probabilities")
+        return [p]
+    proba = _get_flip_clf().predict_proba_rows(np.array(rows, dtype=np.float32))
+    if proba is None:
+        raise RuntimeError("flip classifier returned no probabilities")
+    return [float(p) for p in proba]
 
-    result: dict[str, Any] = {
-        "address": {"address": prop.address, "city": prop.city, "state": prop.state, "zipcode": prop.zipcode},
-        "property_type": prop.property_type,
-        "strategy": strategy,
-        "finance": finance,
-        "pricing": pricing,
-        "score": score_new,
-        "score_legacy": score_legacy,
-        "flip_p_good": flip_p,
-        "arv_q": arv_q,
-    }
 
-    result = apply_guardrails(payload=payload, result=result)
+def analyze_deals_batch(
+    raw_payloads: list[dict[str, Any]],
+    rent_estimator: RentEstimator,
+    repo: DealRepository | None = None,
+    *,
+    save: bool = True,
+    save_async: bool = False,
+    top_k: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    analyze_deal over many payloads, with the model calls coalesced: rent
+    estimation, ARV quantiles and the flip classifier each run once for the
+    whole batch; only financials, scoring and guardrails run per deal.
+    Results are persisted together (one transaction for repos with
+    save_analysis_batch).
+
+    top_k=N returns only the N best deals by score.rank_score, best first
+    (ties keep input order). The rank depends only on rent, financials and
+    ARV, so the flip classifier, pricing and guardrails run for those N
+    deals alone; the other deals are not persisted (callers that need every
+    deal saved, like get_top_deals_for_zip, analyze them all).
+
+    save_async=True queues persistence on a background writer and returns
+    immediately; results then carry no "deal_id" and must not be mutated
+    until written (see wait_for_pending_saves).
+
+    Raises on the first invalid payload, like analyze_deal.
+    """
+    deals = [_prepare_deal(raw) for raw in raw_payloads]
+    if not deals:
+        return []
+
+    # rent fill
+    units = _units_table(deals)
+    _fill_missing_rents_batch(deals, rent_estimator, units)
+
+    # underwriting assumptions
+    assumptions = _DEFAULT_ASSUMPTIONS
+
+    finances: list[dict[str, Any]] = []
+    for deal, gross_rent in zip(deals, _gross_rents(deals, units), strict=True):
+        finance = analyze_property_financials(deal.prop, assumptions, gross_rent)
+        finance["gross_monthly_rent"] = gross_rent
+        finances.append(finance)
+
+    arv_raw = _predict_arv_batch(np.array([deal.list_price for deal in deals]))
+
+    n = len(deals)
+    if n == 1:
+        # Single-deal requests (the HTTP path): the scalar kernels beat
+        # setting up length-1 arrays.
+        arv_qs = [_sanitize_quantiles(arv_raw[0], fallback=deals[0].list_price)]
+        scores = [score_property(finance=finances[0], arv_q=arv_qs[0], rent_q=None)]
+    else:
+        arv_qs = _sanitize_quantiles_batch(arv_raw, [deal.list_price for deal in deals])
+        scores = score_properties_batch(
+            np.array([score_property_inputs(finance, arv_q) for finance, arv_q in zip(finances, arv_qs, strict=True)]),
+            strategy=np.full(n, "hold"),
+            flip_p_good=np.full(n, np.nan),
+        )
+
+    if top_k is not None:
+        # nlargest == sorted(..., reverse=True)[:top_k], ties included, in O(n log k)
+        rank = np.array([score["rank_score"] for score in scores], dtype=float)
+        keep = heapq.nlargest(max(top_k, 0), range(n), key=rank.__getitem__)
+        deals = [deals[i] for i in keep]
+        finances = [finances[i] for i in keep]
+        arv_qs = [arv_qs[i] for i in keep]
+        scores = [scores[i] for i in keep]
+        raw_payloads = [raw_payloads[i] for i in keep]
+
+    flip_ps = _compute_flip_probabilities(finances, deals)
+
+    results: list[dict[str, Any]] = []
+    for deal, finance, arv_q, score_new, flip_p in zip(deals, finances, arv_qs, scores, flip_ps, strict=True):
+        prop = deal.prop
+        pricing = summarize_deal_pricing(
+            prop=prop,
+            sqft=deal.sqft,
+            assumptions=assumptions,
+            arv_q=arv_q,
+        )
+
+        score_legacy = score_deal(finance)
+
+        result: dict[str, Any] = {
+            "address": {"address": prop.address, "city": prop.city, "state": prop.state, "zipcode": prop.zipcode},
+            "property_type": prop.property_type,
+            "strategy": deal.strategy,
+            "finance": finance,
+            "pricing": pricing,
+            "score": score_new,
+            "score_legacy": score_legacy,
+            "flip_p_good": flip_p,
+            "arv_q": arv_q,
+        }
+
+        results.append(apply_guardrails(payload=deal.payload, result=result))
 
     # Persistence: only if save=True AND repo provided
-    deal_id: int | None = None
     if save and repo is not None:
+        if save_async:
+            _io_pool.submit(_persist_analyses, repo, results, raw_payloads)
+        else:
+            for result, deal_id in zip(results, _persist_analyses(repo, results, raw_payloads), strict=True):
+                if deal_id is not None:
+                    result["deal_id"] = deal_id
+
+    return results
+
+
+# Payloads per process-pool task in analyze_deals_parallel; each task is one
+# analyze_deals_batch call, so this is also the model-inference batch size.
+_PARALLEL_CHUNK_SIZE = 1000
+
+# rent estimator of an analyze_deals_parallel worker process (set by _init_batch_worker)
+_worker_rent_estimator: RentEstimator
+
+
+def _init_batch_worker(rent_estimator: RentEstimator) -> None:
+    global _worker_rent_estimator
+    # One LightGBM thread per predict call in each worker; the pool itself
+    # provides the parallelism, so more threads would oversubscribe cores.
+    # (OMP_NUM_THREADS is read when OpenMP loads, which is before the fork.)
+    set_model_threads(1, rent_estimator)
+    _worker_rent_estimator = rent_estimator
+
+
+def _analyze_batch_chunk(raw_payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return analyze_deals_batch(raw_payloads, _worker_rent_estimator, save=False)
+
+
+def analyze_deals_parallel(
+    raw_payloads: list[dict[str, Any]],
+    rent_estimator: RentEstimator,
+    repo: DealRepository | None = None,
+    *,
+    save: bool = True,
+    max_workers: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    analyze_deals_batch for bulk jobs: payloads are split into chunks of
+    _PARALLEL_CHUNK_SIZE, each chunk is analyzed (models batched per chunk)
+    in a process pool of max_workers (default: cpu_count - 1), and results
+    are persisted from this process in one save_analysis_batch call.
+
+    Small inputs, max_workers=1 and platforms without fork run
+    analyze_deals_batch directly. Raises on the first invalid payload.
+    """
+    chunks = [
+        raw_payloads[i : i + _PARALLEL_CHUNK_SIZE] for i in range(0, len(raw_payloads), _PARALLEL_CHUNK_SIZE)
+    ]
+    if max_workers is None:
+        max_workers = max((os.cpu_count() or 1) - 1, 1)
+    if max_workers <= 1 or len(chunks) <= 1 or "fork" not in mp.get_all_start_methods():
+        return analyze_deals_batch(raw_payloads, rent_estimator, repo, save=save)
+
+    # Load models in the parent and fork, so workers inherit them copy-on-write.
+    preload_models()
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(chunks)),
+        mp_context=mp.get_context("fork"),
+        initializer=_init_batch_worker,
+        initargs=(rent_estimator,),
+    ) as pool:
+        # map() yields chunk results in submission order.
+        results = [result for chunk in pool.map(_analyze_batch_chunk, chunks) for result in chunk]
+
+    if save and repo is not None:
+        for result, deal_id in zip(results, _persist_analyses(repo, results, raw_payloads), strict=True):
+            if deal_id is not None:
+                result["deal_id"] = deal_id
+    return results
+
+
+# Background writer for save_async=True; a single worker keeps saves in order.
+_io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="haven-deal-save")
+
+
+def wait_for_pending_saves() -> None:
+    """Block until every save queued with save_async=True has been written."""
+    _io_pool.submit(lambda: None).result()
+
+
+def _persist_analyses(
+    repo: DealRepository, results: list[dict[str, Any]], raw_payloads: list[dict[str, Any]]
+) -> list[int | None]:
+    """
+    Save analyses, one transaction for the whole batch when the repo supports
+    save_analysis_batch. Returns deal ids aligned with `results` (None where a
+    save failed): persistence errors never break analysis.
+    """
+    save_batch = getattr(repo, "save_analysis_batch", None)
+    if save_batch is not None and len(results) > 1:
         try:
-            deal_id = repo.save_analysis(result, raw_payload)
+            return list(save_batch(results, raw_payloads))
+        except Exception as e:
+            # retry row by row so one bad record doesn't drop the whole batch
+            logger.warning("save_analysis_batch_failed", extra={"error": str(e), "n": len(results)})
+
+    deal_ids: list[int | None] = []
+    for result, raw_payload in zip(results, raw_payloads, strict=True):
+        try:
+            deal_ids.append(repo.save_analysis(result, raw_payload))
         except Exception as e:
             # Do NOT break analysis if DB persistence fails (important for stability)
             logger.warning("save_analysis_failed", extra={"error": str(e)})
-            deal_id = None
+            deal_ids.append(None)
+    return deal_ids
 
-    if deal_id is not None:
-        result["deal_id"] = deal_id
 
-    return result
+def analyze_deal(
+    raw_payload: dict[str, Any],
+    rent_estimator: RentEstimator,
+    repo: DealRepository | None = None,
+    *,
+    save: bool = True,
+    save_async: bool = False,
+) -> dict[str, Any]:
+    """
+    Main analysis entrypoint (a batch of one; see analyze_deals_batch).
+
+    NEW:
+    - save=False => preview mode (does not write to deals DB)
+      This is required for fast /leads/from-properties bulk scoring.
+    - save_async=True => persist on a background writer; no "deal_id" in the result
+    - property_type normalization + hard exclusions (no condo/townhouse/manufactured/land)
+    """
+    return analyze_deals_batch([raw_payload], rent_estimator, repo, save=save, save_async=save_async)[0]
+
+
+def analyze_deal_cheap(raw_payload: dict[str, Any]) -> float:
+    """
+    Pricing-only pre-screen score: negative ask price per sqft (higher =
+    cheaper = more promising); -inf when sqft is unknown.
+
+    Skips rent fill, financials, the ARV model, the flip classifier and
+    scoring, so it is only good for ranking candidates before a full
+    analyze_deal. Raises like analyze_deal on invalid/excluded payloads.
+    """
+    payload = validate_and_prepare_payload(raw_payload)
+    _normalize_property_type(payload)
+
+    list_price = _coerce_float(payload.get("list_price"), 0.0)
+    sqft = _coerce_float(payload.get("sqft"), 0.0)
+    if sqft <= 0:
+        return float("-inf")
+    return -list_price / sqft
 
 
 def analyze_deal_with_defaults(raw_payload: dict[str, Any]) -> dict[str, Any]:
     # FIXED: no trailing comma; returns dict, not tuple
-    return analyze_deal(raw_payload=raw_payload, rent_estimator=_default_estimator, repo=_default_repo, save=True)
+    return analyze_deal(
+        raw_payload=raw_payload, rent_estimator=_get_default_estimator(), repo=_get_default_repo(), save=True
+    )
+
+
+def analyze_deals_with_defaults(raw_payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """analyze_deal_with_defaults for many payloads: one analyze_deals_batch call, saved in one transaction."""
+    return analyze_deals_batch(
+        raw_payloads, rent_estimator=_get_default_estimator(), repo=_get_default_repo(), save=True
+    )
+
+
+@lru_cache(maxsize=4096)
+def _analyze_deal_preview_by_key(payload_key: str) -> dict[str, Any]:
+    return analyze_deal(
+        raw_payload=json.loads(payload_key),
+        rent_estimator=_get_default_estimator(),
+        repo=None,
+        save=False,
+    )
+
+
+def analyze_deal_cached(raw_payload: dict[str, Any]) -> dict[str, Any]:
+    """
+    Memoized preview analysis (default estimator, never persisted), keyed on
+    the payload's canonical JSON. Meant for bulk re-runs like backtests where
+    the same property shows up many times.
+
+    Identical payloads share one result dict: treat it as read-only.
+    """
+    key = json.dumps(raw_payload, sort_keys=True, default=str)
+    return _analyze_deal_preview_by_key(key)
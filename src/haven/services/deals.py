@@ -4,13 +4,19 @@ from __future__ import annotations
 from typing import Any, Dict, List
 
 from haven.adapters.sql_repo import SqlPropertyRepository
-from haven.services.deal_analyzer import analyze_deal_with_defaults
+from haven.services.deal_analyzer import analyze_deals_with_defaults
 
 # Minimum list price to consider as a serious investment candidate.
 # This is a business rule: very cheap properties (< $50k) are often
 # distressed, oddball, or otherwise outside the typical buy box.
 MIN_LIST_PRICE: float = 50_000.0
 
+# PropertyRow columns read for each payload (unpacked positionally below).
+_PAYLOAD_COLUMNS = (
+    "address", "city", "state", "zipcode", "list_price",
+    "sqft", "beds", "baths", "property_type", "year_built",
+)
+
 
 def get_top_deals_for_zip(
     zipcode: str,
@@ -26,7 +32,9 @@ def get_top_deals_for_zip(
     - limit_results: how many top deals to keep after scoring.
 
     Result items are exactly the dicts returned by analyze_deal_with_defaults,
-    sorted by score.rank_score (descending).
+    sorted by score.rank_score (descending). All listings are analyzed in one
+    batch, so rent / ARV / flip models run once for the ZIP, and every
+    analyzed deal is saved, not just the returned ones.
 
     This function now enforces a couple of investor-style filters:
       - Ignores properties below MIN_LIST_PRICE (very cheap oddball deals).
@@ -35,44 +43,32 @@ def get_top_deals_for_zip(
     """
     repo = SqlPropertyRepository(uri=db_uri)
 
-    # Pull a batch of properties for this ZIP.
-    props = repo.search(zipcode=zipcode, limit=limit_properties)
+    # Pull a batch of properties for this ZIP, column-wise: only the fields
+    # the payload needs, without hydrating rows or their raw JSON.
+    cols = repo.search_columns(zipcode=zipcode, columns=_PAYLOAD_COLUMNS, limit=limit_properties)
 
-    deals: List[Dict[str, Any]] = []
+    payloads: List[Dict[str, Any]] = []
 
-    for p in props:
-        # Normalize / coalesce core fields out of the PropertyRecord.
-        raw_price = p.get("list_price") or 0.0
-        list_price = float(raw_price)
+    for address, city, state, zc, list_price, sqft, beds, baths, property_type, year_built in zip(
+        *(cols[name] for name in _PAYLOAD_COLUMNS), strict=True
+    ):
+        list_price = float(list_price or 0.0)
 
         # Skip ultra-cheap properties that are usually distressed or outside
         # the target buy box. This matches what a human investor would do.
         if list_price < MIN_LIST_PRICE:
             continue
 
-        # Beds / baths can show up as "bedrooms"/"bathrooms" or "beds"/"baths"
-        # depending on ingestion. We coalesce them defensively.
-        bedrooms = p.get("bedrooms")
-        if bedrooms is None:
-            bedrooms = p.get("beds")
-
-        bathrooms = p.get("bathrooms")
-        if bathrooms is None:
-            bathrooms = p.get("baths")
-
-        sqft = p.get("sqft")
-        year_built = p.get("year_built")
-
         payload: Dict[str, Any] = {
-            "address": p.get("address"),
-            "city": p.get("city"),
-            "state": p.get("state"),
-            "zipcode": p.get("zipcode") or zipcode,
+            "address": address,
+            "city": city,
+            "state": state,
+            "zipcode": zc or zipcode,
             "list_price": list_price,
             "sqft": float(sqft or 0.0),
-            "bedrooms": float(bedrooms or 0.0),
-            "bathrooms": float(bathrooms or 0.0),
-            "property_type": p.get("property_type") or "single_family",
+            "bedrooms": float(beds or 0.0),
+            "bathrooms": float(baths or 0.0),
+            "property_type": property_type or "single_family",
             # Strategy hints the scoring engine how to interpret risk/return.
             "strategy": "hold",
         }
@@ -87,9 +83,10 @@ def get_top_deals_for_zip(
                 # will just skip the age penalty.
                 pass
 
-        # Run the full analysis + scoring using default repo & rent estimator.
-        res = analyze_deal_with_defaults(payload)
-        deals.append(res)
+        payloads.append(payload)
+
+    # Run the full analysis + scoring using default repo & rent estimator.
+    deals = analyze_deals_with_defaults(payloads)
 
     # Sort by rank_score descending (higher = better)
     deals.sort(
@@ -1,6 +1,7 @@
 # src/haven/services/guardrails.py
 from __future__ import annotations
 
+import logging
 from typing import Any, Dict, List
 
 from haven.adapters.logging_utils import get_logger
@@ -244,7 +245,8 @@ def apply_guardrails(
     result["guardrails"]["flags"] = flags
     result["guardrails"]["has_flags"] = bool(flags)
 
-    if flags:
-        logger.info("deal_guardrails_flags", extra={"context": {"flags": flags}})
+    # Per-deal: flags are already in the result, so only log them when debugging.
+    if flags and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("deal_guardrails_flags", extra={"context": {"flags": flags}})
 
     return result
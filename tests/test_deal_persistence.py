@@ -0,0 +1,103 @@
+# tests/test_deal_persistence.py
+import multiprocessing as mp
+
+import pytest
+
+from haven.adapters.sql_repo import SqlDealRepository
+from haven.services import deal_analyzer
+from haven.services.deal_analyzer import (
+    analyze_deal,
+    analyze_deals_batch,
+    analyze_deals_parallel,
+    wait_for_pending_saves,
+)
+
+
+class DummyEstimator:
+    def predict_unit_rent(self, **kwargs) -> float:
+        return 2000.0
+
+
+def _payload(i: int) -> dict:
+    return {
+        "address": f"{i} Test St",
+        "city": "Birmingham",
+        "state": "MI",
+        "zipcode": "48009",
+        "list_price": 200000 + i,
+        "sqft": 1200,
+        "property_type": "single_family",
+    }
+
+
+def test_batch_analysis_saves_all_deals_in_one_transaction(tmp_path):
+    repo = SqlDealRepository(uri=f"sqlite:///{tmp_path / 'deals.db'}")
+
+    results = analyze_deals_batch([_payload(i) for i in range(3)], DummyEstimator(), repo)
+
+    ids = [r["deal_id"] for r in results]
+    assert len(set(ids)) == 3
+    assert [repo.get(i).address for i in ids] == ["0 Test St", "1 Test St", "2 Test St"]
+    row = repo.get(ids[1])
+    assert row.ts is not None
+    assert row.payload["list_price"] == 200001
+    assert row.result["score"] == results[1]["score"]
+
+
+def test_async_save_is_written_after_wait(tmp_path):
+    repo = SqlDealRepository(uri=f"sqlite:///{tmp_path / 'deals.db'}")
+
+    result = analyze_deal(_payload(7), DummyEstimator(), repo, save_async=True)
+    wait_for_pending_saves()
+
+    assert "deal_id" not in result
+    assert [row.address for row in repo.list_recent()] == ["7 Test St"]
+
+
+@pytest.mark.skipif("fork" not in mp.get_all_start_methods(), reason="needs fork")
+def test_parallel_analysis_matches_batch_and_saves_in_parent(tmp_path, monkeypatch):
+    monkeypatch.setattr(deal_analyzer, "_PARALLEL_CHUNK_SIZE", 2)
+    repo = SqlDealRepository(uri=f"sqlite:///{tmp_path / 'deals.db'}")
+    payloads = [_payload(i) for i in range(5)]
+
+    results = analyze_deals_parallel(payloads, DummyEstimator(), repo, max_workers=2)
+    expected = analyze_deals_batch(payloads, DummyEstimator(), save=False)
+
+    assert [{k: v for k, v in r.items() if k != "deal_id"} for r in results] == expected
+    assert [repo.get(r["deal_id"]).address for r in results] == [p["address"] for p in payloads]
+
+
+def test_top_k_keeps_and_saves_only_best_deals(tmp_path):
+    repo = SqlDealRepository(uri=f"sqlite:///{tmp_path / 'deals.db'}")
+    payloads = [{**_payload(i), "list_price": price} for i, price in enumerate([260000, 150000, 320000, 180000])]
+
+    results = analyze_deals_batch(payloads, DummyEstimator(), repo, top_k=2)
+    full = analyze_deals_batch(payloads, DummyEstimator(), save=False)
+    expected = sorted(full, key=lambda r: r["score"]["rank_score"], reverse=True)[:2]
+
+    assert [{k: v for k, v in r.items() if k != "deal_id"} for r in results] == expected
+    assert [r["address"]["address"] for r in results] == ["1 Test St", "3 Test St"]
+    assert sorted(row.address for row in repo.list_recent()) == ["1 Test St", "3 Test St"]
+
+
+def test_top_deals_for_zip_saves_every_analyzed_deal(tmp_path, monkeypatch):
+    from haven.adapters.sql_repo import SqlPropertyRepository
+    from haven.services.deals import get_top_deals_for_zip
+
+    db_uri = f"sqlite:///{tmp_path / 'haven.db'}"
+    prices = [260000.0, 150000.0, 320000.0, 180000.0]
+    SqlPropertyRepository(uri=db_uri).upsert_many(
+        [
+            {**_payload(i), "source": "test", "external_id": str(i), "list_price": price}
+            for i, price in enumerate(prices)
+        ]
+    )
+    deal_repo = SqlDealRepository(uri=f"sqlite:///{tmp_path / 'deals.db'}")
+    monkeypatch.setattr(deal_analyzer, "_get_default_estimator", DummyEstimator)
+    monkeypatch.setattr(deal_analyzer, "_get_default_repo", lambda: deal_repo)
+
+    deals = get_top_deals_for_zip("48009", limit_results=2, db_uri=db_uri)
+
+    ranks = [d["score"]["rank_score"] for d in deals]
+    assert len(deals) == 2 and ranks == sorted(ranks, reverse=True)
+    assert sorted(row.address for row in deal_repo.list_recent()) == [f"{i} Test St" for i in range(4)]
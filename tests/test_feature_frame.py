@@ -0,0 +1,34 @@
+# tests/test_feature_frame.py
+from haven.domain.property import Property
+from haven.services.deal_analyzer import _single_door_rent_features, build_feature_frame
+
+
+def test_feature_frame_matches_scalar_alias_resolution():
+    payloads = [
+        {"bedrooms": 3, "bathrooms": 2, "sqft": 1500, "zipcode": "48009"},
+        {"num_bedrooms": "4", "num_bathrooms": 0, "building_sqft": None, "living_area": 1800},
+        {"bedrooms": 0, "num_bedrooms": 2, "sqft": "", "living_area": "950", "property_type": "duplex_4plex"},
+        {},
+    ]
+    base = {
+        "property_type": "single_family",
+        "address": "1 Main St",
+        "city": "Birmingham",
+        "state": "MI",
+        "zipcode": "48067",
+        "list_price": 200000.0,
+        "down_payment_pct": 0.25,
+        "interest_rate_annual": 0.065,
+        "loan_term_years": 30,
+        "taxes_annual": 3000.0,
+        "insurance_annual": 1200.0,
+    }
+    props = [Property(**base)] * len(payloads)
+
+    frame = build_feature_frame(payloads, props)
+
+    expected = [_single_door_rent_features(prop, p) for p, prop in zip(payloads, props, strict=True)]
+    assert list(frame[["bedrooms", "bathrooms", "sqft"]].itertuples(index=False, name=None)) == expected
+    assert expected[1:] == [(4.0, 0.0, 1800.0), (2.0, 0.0, 950.0), (0.0, 0.0, 0.0)]
+    assert frame["zipcode"].tolist() == ["48009", "48067", "48067", "48067"]
+    assert frame["property_type"].tolist() == ["single_family", "single_family", "duplex_4plex", "single_family"]
@@ -28,3 +28,25 @@ def test_flip_probability_present_when_model_exists():
     assert "flip_p_good" in res
     p = res["flip_p_good"]
     assert p is None or (0.0 <= p <= 1.0)
+
+
+def test_single_row_fast_path_matches_batch(tmp_path):
+    import joblib
+    import lightgbm as lgb
+    import numpy as np
+
+    from haven.adapters.flip_classifier import FLIP_FEATURE_ORDER, FlipClassifier
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, len(FLIP_FEATURE_ORDER)))
+    y = (X[:, 0] + 0.5 * X[:, 1] > 0).astype(int)
+    model = lgb.LGBMClassifier(n_estimators=30, min_child_samples=5, verbose=-1).fit(X, y)
+    path = tmp_path / "flip.joblib"
+    joblib.dump({"model": model, "feature_names": list(FLIP_FEATURE_ORDER)}, path)
+
+    clf = FlipClassifier(model_path=path)
+    rows = X[:5].astype(np.float32)
+
+    single = [clf.predict_proba_row(row) for row in rows]
+    assert clf._single_row_predictor() is not None
+    np.testing.assert_array_equal(single, clf.predict_proba_rows(rows))
@@ -0,0 +1,74 @@
+# tests/test_lead_previews.py
+from haven.api.http import _compute_lead_preview, _compute_lead_previews
+
+
+def _prop(**overrides):
+    base = dict(
+        address="1 A St",
+        city="Birmingham",
+        state="MI",
+        zipcode="48009",
+        list_price=220_000.0,
+        property_type="single_family",
+        sqft=1400.0,
+        beds=3.0,
+        baths=2.0,
+        raw={"daysOnZillow": 30},
+    )
+    base.update(overrides)
+    return base
+
+
+PROPS = [
+    _prop(),
+    _prop(address="2 B St", list_price=None),
+    _prop(address="3 C St", property_type="Manufactured"),
+    _prop(address="4 D St", list_price=410_000.0, sqft=2100.0, beds=4.0, raw={"dom": 120}),
+]
+
+
+def test_batch_previews_match_single_previews():
+    batch = _compute_lead_previews(PROPS, strategy="rental")
+    single = [_compute_lead_preview(p, strategy="rental") for p in PROPS]
+
+    assert batch == single
+    assert batch[1] == {"lead_score": 0.0, "reason": "missing list_price"}
+    assert batch[2]["reason"].startswith("excluded property_type")
+
+
+def test_batch_previews_fall_back_per_property_on_invalid_payload():
+    props = [_prop(), _prop(address="9 Z St", list_price=-5.0)]
+
+    batch = _compute_lead_previews(props, strategy="rental")
+    single = [_compute_lead_preview(p, strategy="rental") for p in props]
+
+    assert batch == single
+    assert batch[1]["reason"].startswith("analyze_deal failed")
+
+
+def test_leads_from_properties_endpoint_scores_batches(client, tmp_path, monkeypatch):
+    from haven.adapters.sql_repo import SqlLeadRepository, SqlPropertyRepository
+    from haven.api import http
+
+    uri = f"sqlite:///{tmp_path / 'haven.db'}"
+    props = SqlPropertyRepository(uri)
+    props.upsert_many(
+        [
+            {**_prop(address=f"{i} A St", list_price=200_000.0 + i), "source": "test", "external_id": str(i)}
+            for i in range(3)
+        ]
+    )
+    leads = SqlLeadRepository(uri)
+    monkeypatch.setattr(http, "_property_repo", props)
+    monkeypatch.setattr(http, "_lead_repo", leads)
+
+    r = client.post("/leads/from-properties", params={"zip": "48009", "workers": 2})
+
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["zip"] == "48009"
+    assert data["count_properties"] == 3
+    assert data["failed_preview"] == 0
+    rows = leads.list_top_leads(zipcode="48009")
+    assert len(rows) == 3
+    assert all(row.reason != "missing preview" for row in rows)
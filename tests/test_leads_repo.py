@@ -0,0 +1,124 @@
+# tests/test_leads_repo.py
+import sqlite3
+
+from haven.adapters.sql_repo import SqlLeadRepository
+from haven.repos.leads_repo import LeadsRepo
+
+
+def _lead(**overrides):
+    base = dict(
+        address="1 A St",
+        city="Birmingham",
+        state="MI",
+        zipcode="48009",
+        source="rentcast",
+        external_id="a",
+        lat=None,
+        lon=None,
+        list_price=200_000.0,
+        dscr=1.1,
+        cash_on_cash_return=0.05,
+        rank_score=10.0,
+        label="maybe",
+        reason="r",
+        lead_score=50.0,
+    )
+    base.update(overrides)
+    return base
+
+
+def _repo(tmp_path) -> LeadsRepo:
+    path = tmp_path / "leads.db"
+    SqlLeadRepository(f"sqlite:///{path}")  # creates the leads table
+    return LeadsRepo(sqlite3.connect(path))
+
+
+def test_bulk_upsert_creates_then_updates(tmp_path):
+    repo = _repo(tmp_path)
+
+    rows = [
+        _lead(external_id="a"),
+        _lead(external_id="b", address="2 A St"),
+        _lead(external_id=None, address="3 A St"),
+    ]
+    assert repo.upsert_leads_bulk(rows) == {"created": 3, "updated": 0}
+
+    rows[0]["lead_score"] = 90.0
+    rows[2]["lead_score"] = 10.0
+    assert repo.upsert_leads_bulk(rows) == {"created": 0, "updated": 3}
+
+    scores = dict(repo.conn.execute("SELECT address, lead_score FROM leads").fetchall())
+    assert scores == {"1 A St": 90.0, "2 A St": 50.0, "3 A St": 10.0}
+
+
+def test_single_upsert_returns_id_and_action(tmp_path):
+    repo = _repo(tmp_path)
+
+    lead_id, action = repo.upsert_lead(**_lead(external_id=""))
+    assert action == "created"
+
+    lead_id2, action2 = repo.upsert_lead(**_lead(external_id=None, label="buy"))
+    assert (lead_id2, action2) == (lead_id, "updated")
+
+
+def test_connection_uses_wal(tmp_path):
+    repo = _repo(tmp_path)
+
+    assert repo.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert repo.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+def test_single_upsert_update_in_same_second_is_not_created(tmp_path):
+    repo = _repo(tmp_path)
+
+    actions = [repo.upsert_lead(**_lead(lead_score=float(i)))[1] for i in range(3)]
+    assert actions == ["created", "updated", "updated"]
+
+
+def test_single_upsert_keeps_second_precision_timestamps(tmp_path):
+    repo = _repo(tmp_path)
+
+    lead_id, _ = repo.upsert_lead(**_lead())
+    repo.upsert_lead(**_lead(lead_score=75.0))
+
+    created_at, updated_at = repo.conn.execute(
+        "SELECT created_at, updated_at FROM leads WHERE lead_id = ?", (lead_id,)
+    ).fetchone()
+    assert len(created_at) == len(updated_at) == len("2024-01-01 00:00:00")
+
+
+def test_address_match_updates_lead_with_external_id(tmp_path):
+    repo = _repo(tmp_path)
+    repo.upsert_leads_bulk([_lead(external_id="a")])
+
+    assert repo.upsert_leads_bulk([_lead(external_id=None, lead_score=70.0)]) == {"created": 0, "updated": 1}
+    assert repo.conn.execute("SELECT external_id, lead_score FROM leads").fetchall() == [("a", 70.0)]
+
+
+def test_repo_opens_db_with_duplicate_leads(tmp_path):
+    path = tmp_path / "leads.db"
+    SqlLeadRepository(f"sqlite:///{path}")
+    conn = sqlite3.connect(path)
+    for _ in range(2):
+        conn.execute(
+            "INSERT INTO leads (source, external_id, address, city, state, zipcode, stage, touches,"
+            " lead_score, created_at, updated_at, snapshot)"
+            " VALUES ('rentcast', 'a', '1 A St', 'B', 'MI', '48009', 'new', 0, 0, datetime('now'), datetime('now'), '{}')"
+        )
+    conn.commit()
+
+    repo = LeadsRepo(conn)
+    assert repo.upsert_leads_bulk([_lead(external_id="a")]) == {"created": 0, "updated": 1}
+
+
+def test_bulk_upsert_leaves_callers_transaction_open(tmp_path):
+    repo = _repo(tmp_path)
+    repo.conn.execute("INSERT INTO lead_events (lead_id, event_type, ts, meta) VALUES (1, 'note', datetime('now'), '{}')")
+    assert repo.conn.in_transaction
+
+    repo.upsert_leads_bulk([_lead()])
+    assert repo.conn.in_transaction
+
+    repo.conn.rollback()
+    assert repo.conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0] == 0
+    assert repo.conn.execute("SELECT COUNT(*) FROM lead_events").fetchone()[0] == 0
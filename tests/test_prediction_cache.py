@@ -0,0 +1,25 @@
+# tests/test_prediction_cache.py
+from haven.services import deal_analyzer
+
+
+def test_arv_predictions_are_memoized_by_exact_price(monkeypatch):
+    calls = []
+
+    def fake_batch(features):
+        calls.append(list(features["base"]))
+        return [[b - 20_000.0, b, b + 20_000.0] for b in features["base"]]
+
+    monkeypatch.setattr(deal_analyzer, "predict_arv_quantiles_batch", fake_batch)
+    deal_analyzer.clear_prediction_caches()
+
+    first = deal_analyzer._predict_arv_batch([200_100.0, 199_900.0, 200_100.0])
+    second = deal_analyzer._predict_arv_batch([200_100.0, 305_000.0])
+
+    # the model sees the true prices, each distinct price once; repeats are cache hits
+    assert calls == [[200_100.0, 199_900.0], [305_000.0]]
+    assert first[0] == first[2] == second[0] == {"q10": 180_100.0, "q50": 200_100.0, "q90": 220_100.0}
+    assert first[1]["q50"] == 199_900.0
+
+    deal_analyzer.clear_prediction_caches()
+    deal_analyzer._predict_arv_batch([200_100.0])
+    assert len(calls) == 3
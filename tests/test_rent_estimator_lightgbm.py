@@ -0,0 +1,122 @@
+# tests/test_rent_estimator_lightgbm.py
+import joblib
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+from haven.adapters.rent_estimator_lightgbm import LightGBMRentEstimator
+
+FEATURES = ["bedrooms", "bathrooms", "sqft", "zipcode", "property_type"]
+
+
+def _estimator(tmp_path) -> LightGBMRentEstimator:
+    rng = np.random.default_rng(0)
+    n = 200
+    X = pd.DataFrame(
+        {
+            "bedrooms": rng.integers(1, 5, n).astype(float),
+            "bathrooms": rng.integers(1, 3, n).astype(float),
+            "sqft": rng.integers(500, 3000, n).astype(float),
+            "zipcode": rng.choice([48009.0, 48067.0], n),
+            "property_type": rng.choice([0.0, 1.0], n),
+        }
+    )
+    y = 300 + 0.9 * X["sqft"] + 100 * X["bedrooms"]
+    model = lgb.LGBMRegressor(n_estimators=20, min_child_samples=5, verbose=-1).fit(X.to_numpy(), y)
+
+    path = tmp_path / "rent.joblib"
+    joblib.dump({"alphas": [0.5], "feature_names": FEATURES, "models": {0.5: model}}, path)
+    return LightGBMRentEstimator(model_path=str(path))
+
+
+def test_batch_rents_match_single_unit_rents(tmp_path):
+    est = _estimator(tmp_path)
+    units = pd.DataFrame(
+        {
+            "bedrooms": [1.0, 3.0, 2.0],
+            "bathrooms": [1.0, 2.0, 1.0],
+            "sqft": [650.0, 1800.0, 1100.0],
+            "zipcode": ["48009", "48067", "4806x"],
+            "property_type": ["single_family", "duplex_4plex", ""],
+        }
+    )
+
+    batch = est.predict_unit_rents(units)
+    single = [est.predict_unit_rent(**row) for row in units.to_dict("records")]
+
+    np.testing.assert_allclose(batch, single)
+
+
+def test_batch_rents_fallback_without_model(tmp_path):
+    est = LightGBMRentEstimator(model_path=str(tmp_path / "missing.joblib"))
+    units = pd.DataFrame({"bedrooms": [2.0, None], "sqft": [1000.0, 800.0]})
+
+    np.testing.assert_allclose(est.predict_unit_rents(units), [1400.0, 880.0])
+
+
+def test_repeated_units_hit_rent_cache(tmp_path, monkeypatch):
+    est = _estimator(tmp_path)
+    units = pd.DataFrame(
+        {
+            "bedrooms": [2.0, 2.0, 3.0],
+            "bathrooms": [1.0, 1.0, 2.0],
+            "sqft": [900.0, 900.0, 1500.0],
+            "zipcode": ["48009", "48009", "48067"],
+            "property_type": ["single_family"] * 3,
+        }
+    )
+    first = est.predict_unit_rents(units)
+
+    calls = []
+    raw = est._predict_raw
+    monkeypatch.setattr(est, "_predict_raw", lambda X: calls.append(len(X)) or raw(X))
+    again = est.predict_unit_rents(units)
+
+    assert calls == []
+    np.testing.assert_array_equal(first, again)
+    assert first[0] == first[1]
+
+
+def test_rent_cache_is_safe_under_concurrent_eviction(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from haven.adapters import rent_estimator_lightgbm
+
+    monkeypatch.setattr(rent_estimator_lightgbm, "_RENT_CACHE_SIZE", 4)
+    est = _estimator(tmp_path)
+    rng = np.random.default_rng(1)
+    frames = [
+        pd.DataFrame(
+            {
+                "bedrooms": rng.integers(1, 5, 30).astype(float),
+                "bathrooms": 1.0,
+                "sqft": rng.choice([700.0, 900.0, 1100.0, 1300.0], 30),
+                "zipcode": "48009",
+                "property_type": "single_family",
+            }
+        )
+        for _ in range(40)
+    ]
+    expected = [est.predict_unit_rents(f) for f in frames]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        got = list(pool.map(est.predict_unit_rents, frames))
+
+    for g, e in zip(got, expected, strict=True):
+        np.testing.assert_array_equal(g, e)
+
+
+def test_set_num_threads_rebuilds_predictors(tmp_path):
+    est = _estimator(tmp_path)
+    unit = {"bedrooms": 2.0, "bathrooms": 1.0, "sqft": 900.0, "zipcode": "48009", "property_type": "single_family"}
+    units = pd.DataFrame([unit, {**unit, "sqft": 1400.0}])
+    single = est.predict_unit_rent(**unit)
+    batch = est.predict_unit_rents(units)
+    fast = est._single_row_predictor()
+
+    est.set_num_threads(1)
+    est.clear_cache()
+
+    assert est._single_row_predictor() is not fast
+    assert est.predict_unit_rent(**unit) == single
+    np.testing.assert_array_equal(est.predict_unit_rents(units), batch)
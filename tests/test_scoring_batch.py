@@ -0,0 +1,88 @@
+# tests/test_scoring_batch.py
+import numpy as np
+
+from haven.analysis.scoring import score_properties_batch, score_property, score_property_inputs
+
+CASES = [
+    dict(
+        finance={"cashflow_monthly_after_debt": 250.0, "cash_on_cash_return": 0.11, "dscr": 1.45, "breakeven_occupancy_pct": 0.8},
+        arv_q={"q10": 180_000.0, "q50": 200_000.0},
+        dom=20,
+        strategy="hold",
+        flip_p_good=None,
+        sqft=1400,
+        year_built=1995,
+    ),
+    dict(
+        finance={"cashflow_monthly_after_debt": -120.0, "cash_on_cash_return": -0.02, "dscr": 0.9, "breakeven_occupancy_pct": 1.05},
+        arv_q={"q10": 120_000.0, "q50": 200_000.0},
+        dom=120,
+        strategy="flip",
+        flip_p_good=0.3,
+        sqft=550,
+        year_built=1950,
+    ),
+    dict(
+        finance={"cashflow_monthly_after_debt": 40.0, "cash_on_cash_return": 0.04, "dscr": 1.1, "breakeven_occupancy_pct": 0.95},
+        arv_q=None,
+        dom=None,
+        strategy="flip",
+        flip_p_good=0.8,
+        sqft=400,
+        year_built=None,
+    ),
+]
+
+
+def test_batch_scores_match_single_scores():
+    inputs = np.array(
+        [
+            score_property_inputs(c["finance"], c["arv_q"], None, c["dom"], c["sqft"], c["year_built"])
+            for c in CASES
+        ]
+    )
+    batch = score_properties_batch(
+        inputs,
+        strategy=np.array([c["strategy"] for c in CASES]),
+        flip_p_good=np.array([np.nan if c["flip_p_good"] is None else c["flip_p_good"] for c in CASES]),
+    )
+    single = [score_property(**c) for c in CASES]
+
+    assert batch == single
+    assert [s["label"] for s in single] == ["buy", "pass", "pass"]
+
+
+def test_vectorized_batch_matches_scalar_kernel_on_random_deals():
+    from haven.analysis import _scoring_nb
+    from haven.analysis.scoring import _LABELS
+
+    rng = np.random.default_rng(0)
+    n = 2000
+    # columns of score_property_inputs, spread over every rule's branches
+    inputs = np.column_stack(
+        [
+            rng.normal(0.0, 300.0, n),
+            rng.normal(0.05, 0.1, n),
+            rng.uniform(-0.5, 3.0, n),
+            rng.uniform(-0.2, 1.3, n),
+            rng.integers(0, 300, n),
+            rng.choice([0.0, 300.0, 500.0, 800.0], n),
+            rng.choice([0.0, 1900.0, 1990.0], n),
+            rng.choice([0.0, 1500.0], n),
+            rng.uniform(0.0, 200_000.0, n),
+            rng.choice([0.0, 150_000.0, 200_000.0], n),
+        ]
+    ).astype(float)
+    strategy = rng.choice(["hold", "flip"], n)
+    flip_p = np.where(rng.random(n) < 0.5, np.nan, rng.random(n))
+
+    batch = score_properties_batch(inputs, strategy=strategy, flip_p_good=flip_p)
+
+    expected = []
+    for row, s, p in zip(inputs.tolist(), strategy.tolist(), flip_p.tolist(), strict=True):
+        code = _scoring_nb.STRATEGY_FLIP if s == "flip" else _scoring_nb.STRATEGY_HOLD
+        rank_score, label_code = _scoring_nb.compute_rank(code, *row, p)
+        label, reason = _LABELS[label_code]
+        expected.append({"rank_score": rank_score, "label": label, "reason": reason})
+    assert batch == expected
+    assert {b["reason"] for b in batch} == {reason for _, reason in _LABELS}
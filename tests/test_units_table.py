@@ -0,0 +1,19 @@
+# tests/test_units_table.py
+import numpy as np
+
+from haven.domain.property import Unit, UnitsTable
+
+
+def test_units_table_masks_fills_and_sums_per_property():
+    a = [Unit(bedrooms=2, market_rent=1500.0), Unit(bedrooms=1, market_rent=None)]
+    b = [Unit(market_rent=40.0), Unit(market_rent=float("nan")), Unit(market_rent=1200.0)]
+    table = UnitsTable.from_unit_lists([a, b])
+
+    assert table.owners().tolist() == [0, 0, 1, 1, 1]
+    rows = np.flatnonzero(table.missing_rent_mask())
+    assert rows.tolist() == [1, 2, 3]
+
+    table.set_rents(rows, np.array([900.0, 800.0, 700.0]))
+
+    assert [u.market_rent for u in a + b] == [1500.0, 900.0, 800.0, 700.0, 1200.0]
+    assert table.rent_totals().tolist() == [2400.0, 2700.0]